@@ -0,0 +1,139 @@
+import csv
+import io
+import random
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import check_csv
+
+global_columns = ['Authors', 'License', 'Link', 'Title', 'Description', 'Community', 'Discipline', 'MediaType',
+                  'ProficiencyLevel', 'PublicationDate', 'FileFormat', 'TargetGroup']
+global_first_names = ["Anna", "Jörg", "Maria", "Paul", "Lena", "Ömer", "Sophie", "Jan-Erik", "Chen", "Fatima"]
+global_last_names = ["Müller", "Schmidt", "Kehrein", "Meyer", "Wagner", "Becker", "Hoffmann", "Schäfer", "Koch", "Li"]
+global_organizations = ["TIB Hannover", "RWTH Aachen University", "Universität Münster", "NFDI e.V."]
+global_words = ["data", "research", "management", "FAIR", "metadata", "workflow", "repository", "publication",
+                "software", "training", "open", "science", "learning", "resource", "archive", "analysis"]
+global_invalid_values = {
+    'Authors': ["", "Max Mustermann", "Mustermann Max : {https://orcid.org/0000-0002-1825-0097}"],
+    'License': ["", "GPL", "CC BY 4.0"],
+    'Link': ["", "http://example.org/resource", "www.example.org"],
+    'Title': [""],
+    'Description': [""],
+    'Community': ["", "NFDI4Ing", "Unknown Community (S)"],
+    'Discipline': ["", "https://example.org/discipline", "Mathematics"],
+    'MediaType': ["", "film", "text * slides"],
+    'ProficiencyLevel': ["", "beginner", "novice * master"],
+    'PublicationDate': ["", "01.02.2023", "2023/02"],
+    'FileFormat': ["", "pdf", ".notaformat"],
+    'TargetGroup': ["", "students", "researcher * aliens"]
+}
+
+
+def parse_arguments():
+    parser = ArgumentParser(description="Generate a synthetic csv-file in the DALIA Interchange Format")
+    parser.add_argument('output_filename')
+    parser.add_argument('-r', '--rows', type=int, default=10000, help="Number of data rows. Default is 10000.")
+    parser.add_argument('-e', '--error_rate', type=float, default=0.05,
+                        help="Probability of every cell to contain an invalid value. Default is 0.05.")
+    parser.add_argument('-l', '--header_lines', type=int, default=0,
+                        help="Number of additional header lines after the names of the columns. Default is 0.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the random generator. Default is 0.")
+    parser.add_argument('--missing', nargs='+', choices=global_columns, default=[],
+                        help="Attributes left out of the csv-file, e.g. to test the errors of missing columns.")
+    parser.add_argument('--stray_quotes', type=float, default=0.0,
+                        help="Probability of a title to start with a size in inches like '5\" screen', an unquoted cell with a quote in it. Default is 0.")
+
+    return parser.parse_args()
+
+
+def multiple(generator, rng, maximum):
+    # Joins between one and maximum generated values with the DIF delimiter ' * '.
+    # Expects: - A function that generates a single value from the random generator.
+    #          - The random generator.
+    #          - The maximum number of values.
+    # Returns: A string.
+    return " * ".join(generator(rng) for _ in range(rng.randint(1, maximum)))
+
+
+def generate_author(rng):
+    # Generates an author with an optional ORCID or an organization.
+    # Expects: The random generator.
+    # Returns: A string.
+    if rng.random() < 0.1:
+        return f"{rng.choice(global_organizations)} : {{organization}}"
+    name = f"{rng.choice(global_last_names)}, {rng.choice(global_first_names)}"
+    if rng.random() < 0.5:
+        name += f" : {{https://orcid.org/0000-000{rng.randint(1, 3)}-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}}}"
+    return name
+
+
+def generate_valid_values(vocabulary):
+    # Creates the generators of valid values for every column of the DIF.
+    # Expects: A VocabularyRegistry.
+    # Returns: A dictionary with the Attributes as keys and functions that generate a value as values.
+    licenses = sorted(vocabulary.licenses)
+    communities = sorted(vocabulary.communities)
+    file_types = sorted(vocabulary.file_types)
+    target_audiences = sorted(vocabulary.target_audiences)
+    media_types = sorted(vocabulary.media_types)
+    proficiency_levels = sorted(vocabulary.proficiency_levels)
+    return {
+        'Authors': lambda rng: multiple(generate_author, rng, 5),
+        'License': lambda rng: rng.choice(licenses),
+        'Link': lambda rng: f"https://example.org/resources/{rng.getrandbits(48):x}",
+        'Title': lambda rng: " ".join(rng.choices(global_words, k=rng.randint(3, 10))).capitalize(),
+        'Description': lambda rng: " ".join(rng.choices(global_words, k=rng.randint(50, 300))),
+        'Community': lambda rng: multiple(lambda r: f"{r.choice(communities)} ({r.choice(['S', 'R', 'RS'])})", rng, 3),
+        'Discipline': lambda rng: multiple(
+            lambda r: f"https://w3id.org/kim/hochschulfaechersystematik/n{r.randint(1, 300)}", rng, 3),
+        'MediaType': lambda rng: multiple(lambda r: r.choice(media_types), rng, 2),
+        'ProficiencyLevel': lambda rng: multiple(lambda r: r.choice(proficiency_levels), rng, 2),
+        'PublicationDate': lambda rng: rng.choice(
+            [f"{rng.randint(1990, 2025)}", f"{rng.randint(1990, 2025)}-{rng.randint(1, 12):02}",
+             f"{rng.randint(1990, 2025)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}"]),
+        'FileFormat': lambda rng: multiple(lambda r: r.choice(file_types), rng, 3),
+        'TargetGroup': lambda rng: multiple(lambda r: r.choice(target_audiences), rng, 3)
+    }
+
+
+def generate_dataset(path, rows, error_rate=0.05, header_lines=0, seed=0, missing=(), stray_quotes=0.0):
+    # Writes a synthetic csv-file in the DALIA Interchange Format. Every cell contains an invalid value with the
+    # probability of the error rate.
+    # Expects: - The path of the csv-file.
+    #          - The number of data rows.
+    #          - The probability of a cell to be invalid.
+    #          - The number of additional header lines after the names of the columns.
+    #          - The seed of the random generator.
+    #          - The Attributes left out of the csv-file.
+    #          - The probability of a title to start with a size in inches, whose quote is written without quoting the
+    #            cell, as a csv-reader has to take it literally.
+    # Returns: None.
+    rng = random.Random(seed)
+    valid_values = generate_valid_values(check_csv.get_vocabulary())
+    columns = [column for column in global_columns if column not in missing]
+    with open(path, 'w', newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for _ in range(header_lines):
+            writer.writerow(["header"] * len(columns))
+        for _ in range(rows):
+            cells = [rng.choice(global_invalid_values[column]) if rng.random() < error_rate
+                     else valid_values[column](rng) for column in columns]
+            if 'Title' in columns and stray_quotes and rng.random() < stray_quotes:
+                position = columns.index('Title')
+                title = f'{rng.randint(5, 30)}" {cells[position]}'
+                cells[position] = "\x00"
+                line = io.StringIO()
+                csv.writer(line).writerow(cells)
+                file.write(line.getvalue().replace("\x00", title))
+            else:
+                writer.writerow(cells)
+
+
+if __name__ == '__main__':
+    args = parse_arguments()
+    generate_dataset(args.output_filename, args.rows, args.error_rate, args.header_lines, args.seed, args.missing,
+                     args.stray_quotes)
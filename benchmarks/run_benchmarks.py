@@ -0,0 +1,348 @@
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+import check_csv
+from generate_dataset import generate_dataset
+
+global_engines = ['serial', 'vectorized', 'stream', 'mapped']
+global_adversarial_authors = {
+    'word': lambda length: "a" * length,
+    'commas': lambda length: "a," * (length // 2),
+    'identifiers': lambda length: "Doe, Jane" + " : {0000-0002}" * (length // 14),
+    'names': lambda length: " * ".join(["Doe, Jane : {0000-0002}"] * (length // 25)) + " * Doe",
+    'organizations': lambda length: "Name : " * (length // 7)
+}
+global_startup_modes = {
+    'fast': [],
+    'vectorized': ['--vectorized']
+}
+# The options of check_file every engine is run with in the consistency check. The small chunks make the stream mode
+# carry the error budget and the errors of missing columns across many chunks.
+global_consistency_engines = {
+    'serial': {},
+    'vectorized': {'vectorized': True},
+    'stream': {'stream': True, 'chunk_size': 7},
+    'mapped': {'mapped': True}
+}
+# The shapes of the csv-files of the consistency check: the options of generate_dataset and further options of
+# check_file.
+global_consistency_cases = {
+    'complete': ({}, {}),
+    'missing': ({'missing': ['Link', 'License']}, {}),
+    'missing-budget': ({'missing': ['Link', 'License']}, {'max_errors': 300}),
+    'column-budget': ({}, {'column_budgets': {'Authors': 20}}),
+    'stray-quotes': ({'stray_quotes': 0.2}, {})
+}
+# Runs the compliance check like its command line does and reports afterwards whether pandas was imported.
+global_startup_probe = ("import runpy, sys; sys.argv = sys.argv[1:]; runpy.run_path(sys.argv[0], run_name='__main__'); "
+                        "print('pandas' in sys.modules)")
+
+
+def parse_arguments():
+    parser = ArgumentParser(description="Measure the throughput of the DALIA Interchange Format compliance check")
+    parser.add_argument('-r', '--rows', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help="Numbers of rows of the generated datasets. Default is 10000 100000 1000000.")
+    parser.add_argument('-e', '--error_rate', type=float, default=0.05,
+                        help="Probability of every cell to contain an invalid value. Default is 0.05.")
+    parser.add_argument('--engines', nargs='+', choices=global_engines, default=global_engines,
+                        help="Engines to be measured end-to-end. Default is all engines.")
+    parser.add_argument('--skip_functions', action='store_true',
+                        help="Only measure the engines end-to-end and not the single check-functions.")
+    parser.add_argument('--adversarial_lengths', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Lengths of the pathological author names the author check is measured on. Default is 1000 10000 100000.")
+    parser.add_argument('--skip_adversarial', action='store_true',
+                        help="Do not measure the author check on pathological names.")
+    parser.add_argument('--startup_rows', type=int, default=50,
+                        help="Number of rows of the dataset the startup time is measured on. Default is 50.")
+    parser.add_argument('--startup_runs', type=int, default=5,
+                        help="Number of runs per mode of which the fastest is reported. Default is 5.")
+    parser.add_argument('--max_startup', type=float,
+                        help="Fail if checking the small dataset on the fast path takes longer than this many seconds.")
+    parser.add_argument('--skip_startup', action='store_true',
+                        help="Do not measure the startup time on a small dataset.")
+    parser.add_argument('--consistency_rows', type=int, default=1000,
+                        help="Number of rows of the datasets all engines have to write the same report for. Default is 1000.")
+    parser.add_argument('--skip_consistency', action='store_true',
+                        help="Do not compare the reports of the engines.")
+    parser.add_argument('-o', '--output_filename',
+                        help="Write the results as JSON to this file instead of the terminal.")
+
+    return parser.parse_args()
+
+
+def peak_rss():
+    # Returns the peak resident set size of the current process.
+    # Expects: None.
+    # Returns: The peak RSS in kilobytes.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def result(name, rows, seconds, rss=None):
+    # Builds the record of a single measurement.
+    # Expects: - The name of the measurement.
+    #          - The number of checked rows.
+    #          - The measured wall time in seconds.
+    #          - The peak RSS in kilobytes, if it was measured.
+    # Returns: A dictionary.
+    return {
+        'name': name,
+        'rows': rows,
+        'seconds': round(seconds, 6),
+        'rows_per_second': round(rows / seconds) if seconds > 0 else None,
+        'peak_rss_kb': rss
+    }
+
+
+def run_engine(engine, path, rows, report_path, results):
+    # Checks a csv-file end-to-end with one engine, including reading the file and writing the report. Is run in a
+    # fresh process, so the peak RSS only belongs to this engine.
+    # Expects: - The name of the engine.
+    #          - The path of the csv-file.
+    #          - The number of rows of the csv-file.
+    #          - The path of the report.
+    #          - A queue the result is put in.
+    # Returns: None.
+    start = time.perf_counter()
+    if engine == 'stream':
+        writers = [check_csv.WideReportWriter(report_path)]
+        check_csv.check_csv_stream(path, 0, check_csv.global_chunk_size, writers)
+        check_csv.close_report_writers(writers)
+    elif engine == 'mapped':
+        mapped_file = check_csv.MappedCsv(path)
+        errors = check_csv.run_checks(mapped_file)
+        mapped_file.close()
+        check_csv.write_output(errors, report_path)
+    else:
+        data_frame = check_csv.read_csv(path)
+        check_csv.fill_empty_cells(data_frame)
+        errors = check_csv.run_checks(data_frame, vectorized=engine == 'vectorized')
+        check_csv.write_output(errors, report_path)
+    results.put(result(f"check_data/{engine}", rows, time.perf_counter() - start, peak_rss()))
+
+
+def benchmark_engines(engines, path, rows, directory):
+    # Measures all engines end-to-end, each in a process of its own.
+    # Expects: - The names of the engines.
+    #          - The path of the csv-file.
+    #          - The number of rows of the csv-file.
+    #          - A directory for the reports.
+    # Returns: A list of results.
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for engine in engines:
+        queue = context.Queue()
+        process = context.Process(target=run_engine,
+                                  args=(engine, path, rows, os.path.join(directory, f"report-{engine}.csv"), queue))
+        process.start()
+        results.append(queue.get())
+        process.join()
+    return results
+
+
+def benchmark_functions(path, rows):
+    # Measures every check-function of the rule plan and the vectorized engine on its column.
+    # Expects: - The path of the csv-file.
+    #          - The number of rows of the csv-file.
+    # Returns: A list of results.
+    data_frame = check_csv.read_csv(path)
+    check_csv.fill_empty_cells(data_frame)
+    check_csv.get_vocabulary()
+    results = []
+    for checkers in (check_csv.global_rule_checkers, check_csv.global_vectorized_checkers):
+        for column, checker in checkers.items():
+            start = time.perf_counter()
+            checker(data_frame[column])
+            results.append(result(f"{column}/{check_csv.checker_name(checker)}", rows, time.perf_counter() - start))
+    return results
+
+
+def benchmark_adversarial(lengths, cells=10):
+    # Measures every check-function of the column 'Authors' on pathological names, which make backtracking patterns
+    # take quadratic or exponential time. Every cell is distinct, so no result is taken from a memo.
+    # Expects: - A list of lengths of the names.
+    #          - The number of cells per kind and length.
+    # Returns: A list of results.
+    check_csv.get_vocabulary()
+    results = []
+    for kind, generate in global_adversarial_authors.items():
+        for length in lengths:
+            authors = pd.Series([generate(length) + " " * cell for cell in range(cells)], dtype=object)
+            for checkers in (check_csv.global_rule_checkers, check_csv.global_vectorized_checkers):
+                checker = checkers['Authors']
+                start = time.perf_counter()
+                checker(authors)
+                results.append(result(f"adversarial/{kind}-{length}/{check_csv.checker_name(checker)}", cells,
+                                      time.perf_counter() - start))
+    return results
+
+
+def benchmark_startup(rows, error_rate, runs=5):
+    # Measures the time the command line takes to check a small csv-file, including starting the interpreter and
+    # importing the modules, once on the fast path and once with the vectorized engine, which imports pandas. Every
+    # mode is run several times and the fastest run is reported.
+    # Expects: - The number of rows of the dataset.
+    #          - The probability of a cell to be invalid.
+    #          - The number of runs per mode.
+    # Returns: A list of results with an additional key 'pandas_imported'.
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "startup.csv")
+        generate_dataset(path, rows, error_rate)
+        for mode, arguments in global_startup_modes.items():
+            # The report name is resolved relative to the working directory.
+            command = [sys.executable, "-c", global_startup_probe, "check_csv.py", path,
+                       "-o", os.path.relpath(os.path.join(directory, f"report-{mode}")), *arguments]
+            fastest = None
+            for _ in range(runs):
+                start = time.perf_counter()
+                process = subprocess.run(command, capture_output=True, text=True, check=True)
+                seconds = time.perf_counter() - start
+                fastest = seconds if fastest is None else min(fastest, seconds)
+            entry = result(f"startup/{mode}", rows, fastest)
+            entry['pandas_imported'] = process.stdout.strip().splitlines()[-1] == "True"
+            results.append(entry)
+    return results
+
+
+def startup_regressions(results, max_startup=None):
+    # Collects the regressions of the startup time: The fast path must not import pandas and must not take longer
+    # than the given limit.
+    # Expects: - A list of results.
+    #          - The maximal number of seconds of the fast path, if there is a limit.
+    # Returns: A list of messages, which is empty if there is no regression.
+    regressions = []
+    for entry in results:
+        if entry['name'] != "startup/fast":
+            continue
+        if entry['pandas_imported']:
+            regressions.append("The fast path imported pandas.")
+        if max_startup is not None and entry['seconds'] > max_startup:
+            regressions.append(f"The fast path took {entry['seconds']:.3f} seconds, the limit is {max_startup}.")
+    return regressions
+
+
+def consistency_regressions(rows, error_rate):
+    # Checks csv-files of several shapes, including missing columns, error budgets and quotes within unquoted cells, with every
+    # engine and compares the long reports, which are ordered by line, to the one of the serial engine.
+    # Expects: - The number of rows of the datasets.
+    #          - The probability of a cell to be invalid.
+    # Returns: A list of messages, which is empty if all engines wrote the same reports.
+    regressions = []
+    with tempfile.TemporaryDirectory() as directory:
+        for case, (dataset_options, options) in global_consistency_cases.items():
+            path = os.path.join(directory, f"{case}.csv")
+            generate_dataset(path, rows, error_rate, **dataset_options)
+            reports = dict()
+            for engine, engine_options in global_consistency_engines.items():
+                report_name = os.path.join(directory, f"{case}-{engine}")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    check_csv.check_file(path, report_name, formats=['long'], **engine_options, **options)
+                with open(f"{report_name}.long.csv", 'rb') as report:
+                    reports[engine] = report.read()
+            for engine, report in reports.items():
+                if report != reports['serial']:
+                    regressions.append(f"The {engine} engine wrote another report than the serial engine for the "
+                                       f"dataset '{case}'.")
+            if not options:
+                regressions.extend(sample_regressions(case, path, rows, reports['serial'], directory))
+    return regressions
+
+
+def sample_regressions(case, path, rows, report, directory):
+    # Checks a sample of all rows and a sample of half of the rows of a csv-file. The first has to write the report of the
+    # serial engine, every line of the report of the second has to be in it, so the sampled rows keep their line numbers.
+    # Expects: - The name of the dataset.
+    #          - The path to the csv-file.
+    #          - The number of rows of the csv-file.
+    #          - The long report of the serial engine.
+    #          - The directory of the reports.
+    # Returns: A list of messages, which is empty if the samples wrote the expected reports.
+    regressions = []
+    lines = set(report.splitlines())
+    for size in (rows, rows // 2):
+        report_name = os.path.join(directory, f"{case}-sample-{size}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            check_csv.check_sample(path, report_name, size, seed=0, formats=['long'])
+        with open(f"{report_name}.long.csv", 'rb') as sample_report:
+            sample = sample_report.read()
+        if size == rows and sample != report or not set(sample.splitlines()) <= lines:
+            regressions.append(f"The sample of {size} rows wrote another report than the serial engine for the "
+                               f"dataset '{case}'.")
+    return regressions
+
+
+def run_benchmarks(row_counts, error_rate, engines, skip_functions=False, adversarial_lengths=()):
+    # Generates a dataset for every number of rows and measures the check-functions and engines on it.
+    # Expects: - A list of numbers of rows.
+    #          - The probability of a cell to be invalid.
+    #          - The names of the engines to be measured end-to-end.
+    #          - Whether the single check-functions are not to be measured.
+    #          - A list of lengths of pathological author names.
+    # Returns: A dictionary with the environment and a list of all results.
+    results = benchmark_adversarial(adversarial_lengths) if adversarial_lengths else []
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in row_counts:
+            path = os.path.join(directory, f"dataset-{rows}.csv")
+            generate_dataset(path, rows, error_rate)
+            if not skip_functions:
+                results.extend(benchmark_functions(path, rows))
+            results.extend(benchmark_engines(engines, path, rows, directory))
+            os.remove(path)
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'error_rate': error_rate,
+        'results': results
+    }
+
+
+def print_summary(benchmark):
+    # Prints the results as a table to stderr.
+    # Expects: The dictionary returned by run_benchmarks.
+    # Returns: None.
+    print(f"{'name':<56}{'rows':>10}{'seconds':>12}{'rows/s':>12}{'peak RSS':>12}", file=sys.stderr)
+    for entry in benchmark['results']:
+        rss = f"{entry['peak_rss_kb'] // 1024} MB" if entry['peak_rss_kb'] is not None else ""
+        print(f"{entry['name']:<56}{entry['rows']:>10}{entry['seconds']:>12.3f}{entry['rows_per_second'] or 0:>12}"
+              f"{rss:>12}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    args = parse_arguments()
+    os.chdir(Path(__file__).resolve().parent.parent)
+
+    startup_results = [] if args.skip_startup else benchmark_startup(args.startup_rows, args.error_rate,
+                                                                      args.startup_runs)
+    benchmark_results = run_benchmarks(args.rows, args.error_rate, args.engines, args.skip_functions,
+                                       [] if args.skip_adversarial else args.adversarial_lengths)
+    benchmark_results['results'] = startup_results + benchmark_results['results']
+    print_summary(benchmark_results)
+    if args.output_filename is not None:
+        with open(args.output_filename, 'w') as output:
+            json.dump(benchmark_results, output, indent=2)
+    else:
+        print(json.dumps(benchmark_results, indent=2))
+    regressions = startup_regressions(startup_results, args.max_startup)
+    if not args.skip_consistency:
+        regressions.extend(consistency_regressions(args.consistency_rows, args.error_rate))
+    for regression in regressions:
+        print(regression, file=sys.stderr)
+    if regressions:
+        sys.exit(1)
@@ -1,25 +1,211 @@
 import csv
+import glob
+import hashlib
+import importlib.util
+import io
+import mmap
+import math
+import os
+import pickle
 import re
+import sqlite3
+import sys
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from functools import partial
+from itertools import groupby
+from urllib.parse import parse_qs, urlparse
 
-import pandas as pd
 import json
 from argparse import ArgumentParser
 
 global_header_lines = 0
 global_line_offset = 2
+global_row_offset = 0
+global_chunk_size = 10000
+global_check_hooks = []
+global_progress_hooks = []
+global_progress_step = 10000
+global_check_statistics = None
+global_multi_value_columns = ['Authors', 'Community', 'Discipline', 'MediaType', 'ProficiencyLevel', 'FileFormat',
+                              'TargetGroup']
 global_media_types = ["audio", "video", "text", "presentation", "code", "image", "multipart"]
 global_proficiency_levels = ["novice", "advanced beginner", "competent", "proficient", "expert"]
+global_vocabulary = None
+global_vocabulary_sources = {
+    'licenses': "resources/licenses.json",
+    'communities': "resources/communities.json",
+    'file_types': "resources/mimeData.json",
+    'target_audiences': "resources/target_audience.csv"
+}
+global_vocabulary_cache = "resources/.vocabulary_cache.pickle"
+global_discipline_scheme = "resources/hochschulfaechersystematik.json"
+global_link_cache = "resources/.link_cache.sqlite"
+global_fast_path_size = 1 << 20
+global_missing_values = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA",
+    "NULL", "NaN", "None", "n/a", "nan", "null"])
+global_missing_bytes = frozenset(value.encode() for value in global_missing_values)
+# Stands in for the cells of a memory-mapped csv-file that are not empty in columns whose values no rule inspects.
+global_undecoded_cell = "\x00"
+global_split_pattern = re.compile(r'\s\*\s')
+# A name is valid if it contains the name of a person ('Last, First', optionally followed by ' : {id}' and further
+# names), the name of an organization ('Name : {organization}') or is 'n/a'. As the pattern is searched anywhere in the
+# name and the identifiers and further names are optional, finding the comma between a last and a first name is enough.
+# Every alternative has a fixed length, so the search takes linear time even on pathological names, where nested
+# repetitions backtrack quadratically.
+global_author_pattern = re.compile(r"[\w-],\s[\w-]|\s:\s\{organization|^n/a$")
+global_link_pattern = re.compile(r"^https://\S+(?:\s\*\shttps://\S+)*$")
+global_community_pattern = re.compile(r'^[\S\s]*\s\((?:RS|SR|S|R)\)$')
+global_community_role_pattern = re.compile(r'\s\(\S*\)')
+global_discipline_pattern = re.compile(r"^https://w3id\.org/kim/hochschulfaechersystematik/n\d+")
+global_date_pattern = re.compile(r"^\d{4}(?:-\d{2}(?:-\d{2})?)?$")
+global_file_format_pattern = re.compile(r"^\.\w+(?:$|\s\*\s\.\w+)*$")
+global_target_group_pattern = re.compile(r"^\w+(?:\s\(?\w+\)?)?(?:$|\s\*\s\w+(?:$|\s\(?\w+\)?))*")
 
 
 def parse_arguments():
     parser = ArgumentParser(description="Check your csv-file if it is in compliance with the DALIA Interchange Format")
-    parser.add_argument('input_filename')
+    parser.add_argument('input_filename', nargs='*',
+                        help="The csv-file to be checked. In the batch mode any number of csv-files, directories, glob patterns and manifests (.txt-files listing one of those per line).")
     parser.add_argument('-o', '--output_filename',
-                        help="Set the output filename to a custom value. Default is 'report'.")
+                        help="Set the output filename to a custom value. Default is 'report'. In the batch mode the directory the reports and the summary are written to. Default is 'reports'.")
+    parser.add_argument('-b', '--batch', action='store_true',
+                        help="Check many csv-files in one process. Every csv-file gets a report of its own and a summary of all files is written to summary.csv.")
     parser.add_argument('-l', '--header_lines', type=int,
                         help="If your csv-file contains more header lines than just the names of the columns, provide the number of lines to ensure accurate line errors.")
-
-    return parser.parse_args()
+    parser.add_argument('-s', '--stream', action='store_true',
+                        help="Read and check the csv-file in chunks of rows and write the report while checking. Use this for files that do not fit into memory.")
+    parser.add_argument('--chunk_size', type=int, default=global_chunk_size,
+                        help=f"Number of rows per chunk in the stream mode. Default is {global_chunk_size}.")
+    parser.add_argument('--checkpoint',
+                        help="Save the progress of the check to this file after a chunk at most once per interval, so an interrupted check of the same csv-file with the same options continues after the last saved chunk. Implies --stream. The file is removed once the check finished.")
+    parser.add_argument('--checkpoint_interval', type=float, default=60,
+                        help="Seconds between two saves of the checkpoint. Default is 60.")
+    parser.add_argument('--progress', action='store_true',
+                        help="Print the checked rows, the rows per second, the estimated remaining time and the errors per Attribute so far to stderr while checking.")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="Number of processes the columns and rows are checked in. In the batch mode the number of csv-files checked at the same time. Default is 1.")
+    parser.add_argument('--vectorized', action='store_true',
+                        help="Check every column as a whole with pandas string operations instead of row by row.")
+    parser.add_argument('-m', '--mmap', action='store_true',
+                        help="Read the csv-file through a memory map and only decode the cells of columns a rule inspects. Needs much less memory for large files with long descriptions.")
+    parser.add_argument('-p', '--profile', action='store_true',
+                        help="Measure every check-function and print a summary to the terminal.")
+    parser.add_argument('--profile_json',
+                        help="Write the measurements of every check-function as JSON to this file.")
+    parser.add_argument('--profile_trace',
+                        help="Write the measurements of every check-function in the Chrome trace event format to this file.")
+    parser.add_argument('-f', '--report_format', nargs='+', choices=list(global_report_formats), default=['wide'],
+                        help="The formats of the report: 'wide' (one column per Attribute, .csv), 'long' (one row per error, .long.csv), 'jsonl' (one JSON object per error, .jsonl) or 'parquet' (one row per error, .parquet, needs pyarrow). The errors are written chunk by chunk as they are produced. Default is 'wide'.")
+    parser.add_argument('-c', '--cache',
+                        help="Path to a SQLite-file, in which the errors of every row are cached. Rows that did not change since the last run with the same cache are not checked again.")
+
+    parser.add_argument('--max_errors', type=int,
+                        help="Stop checking once this number of errors is reached. The report contains the errors up to the row in which the check stopped.")
+    parser.add_argument('--column_budget', nargs='+', metavar='ATTRIBUTE=ERRORS',
+                        help="Stop checking once an Attribute reaches its number of errors, e.g. 'Link=100 License=50'.")
+    parser.add_argument('--fail_fast', action='store_true',
+                        help="Only write the missing mandatory Attributes to the report and do not check the rows if one is missing.")
+    parser.add_argument('--sample', type=int, metavar='ROWS',
+                        help="Only check a stratified random sample of this many rows and print the estimated share of rows with errors of every Attribute with its confidence interval.")
+    parser.add_argument('--strata', type=int, default=10,
+                        help="Number of strata of consecutive rows the sample is drawn from in proportion to their size. Default is 10.")
+    parser.add_argument('--seed', type=int,
+                        help="Seed of the random numbers of the sample, so a sample can be drawn again.")
+    parser.add_argument('--confidence', type=float, default=0.95,
+                        help="Confidence level of the intervals of the estimated shares. Default is 0.95.")
+    parser.add_argument('-d', '--duplicates', action='store_true',
+                        help="Also find links and titles used by more than one item and authors with different identifiers.")
+    parser.add_argument('--similarity', type=float,
+                        help="Also find near duplicate titles and descriptions with at least this estimated similarity between 0 and 1, e.g. 0.8. Implies --duplicates.")
+    parser.add_argument('--deep_check', nargs='*', choices=['links', 'disciplines'],
+                        help="Also check whether the links can be resolved and whether the disciplines are part of the local snapshot of the Hochschulfächersystematik. Without values both are checked, the disciplines only if the snapshot exists.")
+    parser.add_argument('--discipline_scheme', default=global_discipline_scheme,
+                        help=f"The local snapshot of the Hochschulfächersystematik, the JSON of the scheme or a text file with one URI per line. Default is '{global_discipline_scheme}'.")
+    parser.add_argument('--link_cache', default=global_link_cache,
+                        help=f"SQLite-file, in which the status codes of the links are cached. Default is '{global_link_cache}'.")
+    parser.add_argument('--link_ttl', type=float, default=24,
+                        help="Hours after which the cached status code of a link is requested again. Default is 24.")
+    parser.add_argument('--link_concurrency', type=int, default=16,
+                        help="Maximal number of links requested at the same time. Default is 16.")
+    parser.add_argument('--link_timeout', type=float, default=10,
+                        help="Timeout of a request for a link in seconds. Default is 10.")
+    parser.add_argument('--link_origin',
+                        help="Send the requests for all links to this origin, e.g. a local stand-in server like 'http://127.0.0.1:8000', which receives the path and query of every link.")
+    parser.add_argument('--serve', type=int, metavar='PORT',
+                        help="Run as a validation service answering HTTP requests on this port instead of checking a file.")
+    parser.add_argument('--host', default="127.0.0.1",
+                        help="Host name or address the validation service listens on. Default is 127.0.0.1.")
+    parser.add_argument('--serve_stdin', action='store_true',
+                        help="Run as a validation service answering requests as line-delimited JSON on stdin and stdout.")
+
+    args = parser.parse_args()
+    serving = args.serve is not None or args.serve_stdin
+    if not serving and not args.input_filename:
+        parser.error("the following arguments are required: input_filename")
+    if not args.batch and len(args.input_filename) > 1:
+        parser.error("more than one input file can only be checked in the batch mode (--batch)")
+    if args.batch and args.cache is not None:
+        parser.error("the cache (--cache) can not be used in the batch mode")
+    if args.batch and args.workers > 1 and (args.profile or args.profile_json or args.profile_trace):
+        parser.error("the check-functions can not be measured in the batch mode with more than one worker")
+    if args.checkpoint is not None:
+        if args.batch or args.mmap or args.sample is not None or 'parquet' in args.report_format:
+            parser.error("the checkpoint (--checkpoint) can not be used with --batch, --mmap, --sample or the report "
+                         "format 'parquet'")
+        if args.checkpoint_interval < 0:
+            parser.error("the interval of the checkpoint (--checkpoint_interval) can not be negative")
+        args.stream = True
+    if args.mmap and (args.stream or args.vectorized or args.cache is not None):
+        parser.error("the memory map (--mmap) can not be used with --stream, --vectorized or --cache")
+    if args.mmap and not args.batch and args.workers > 1:
+        parser.error("the memory map (--mmap) can not be used with more than one worker")
+    if args.mmap and (args.profile or args.profile_json or args.profile_trace):
+        parser.error("the check-functions can not be measured with the memory map (--mmap)")
+    if args.chunk_size < 1:
+        parser.error("the number of rows per chunk (--chunk_size) has to be at least 1")
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("the maximal number of errors (--max_errors) has to be at least 1")
+    column_budgets = dict()
+    for column_budget in args.column_budget or []:
+        column, _, budget = column_budget.partition("=")
+        if column not in global_absent_message_ids or not budget.isdigit() or int(budget) < 1:
+            parser.error(f"the budget '{column_budget}' has to be an Attribute of the DIF, '=' and a number of at "
+                         f"least 1")
+        column_budgets[column] = int(budget)
+    args.column_budget = column_budgets
+    if args.sample is not None:
+        if args.sample < 1 or args.strata < 1:
+            parser.error("the sample (--sample) and the number of strata (--strata) have to be at least 1")
+        if not 0 < args.confidence < 1:
+            parser.error("the confidence level (--confidence) has to be between 0 and 1")
+        if args.batch or args.stream or args.vectorized or args.cache is not None or args.workers > 1:
+            parser.error("the sample (--sample) can not be used with --batch, --stream, --vectorized, --cache or "
+                         "more than one worker")
+        if args.duplicates or args.similarity is not None or args.max_errors is not None or column_budgets:
+            parser.error("the sample (--sample) can not be used with --duplicates, --similarity, --max_errors or "
+                         "--column_budget")
+    if args.similarity is not None and not 0 < args.similarity <= 1:
+        parser.error("the similarity (--similarity) has to be between 0 and 1")
+    if args.deep_check == []:
+        args.deep_check = ['links', 'disciplines']
+        if not os.path.isfile(args.discipline_scheme):
+            print(f"Only the links are checked, as the snapshot of the discipline scheme '{args.discipline_scheme}' "
+                  f"does not exist. Download the JSON of the Hochschulfächersystematik from skohub.io to also check "
+                  f"the disciplines.")
+            args.deep_check = ['links']
+    if args.deep_check and args.batch and args.workers > 1:
+        parser.error("the deep check (--deep_check) can not be used in the batch mode with more than one worker")
+    if args.deep_check and 'disciplines' in args.deep_check and not os.path.isfile(args.discipline_scheme):
+        parser.error(f"the snapshot of the discipline scheme '{args.discipline_scheme}' does not exist, download the "
+                     f"JSON of the Hochschulfächersystematik from skohub.io or use --deep_check links")
+    if 'parquet' in args.report_format and importlib.util.find_spec('pyarrow') is None:
+        parser.error("the report format 'parquet' needs the package pyarrow")
+    return args
 
 
 def read_license_file():
@@ -48,6 +234,14 @@ def read_data_formats_file():
     return file_formats_list
 
 
+def read_target_audience_file():
+    # Reads the target audience picklist from the header of its csv-file.
+    # Expects: None.
+    # Returns: A list of strings.
+    with open("resources/target_audience.csv", 'r', newline="") as file:
+        return next(csv.reader(file), [])
+
+
 def extract_file_types(file_format_list):
     file_types = []
     for file_formats in file_format_list:
@@ -67,17 +261,336 @@ def extract_identifier(license_data):
     return identifiers
 
 
+class VocabularyRegistry:
+    # Holds all controlled vocabularies of the DIF as frozensets, so every check-function can share one instance
+    # instead of reading the resource files on each call. The parsed vocabularies from the resource files are cached
+    # as a pickled snapshot, which is rebuilt as soon as the modification time of one of the sources changes.
+
+    def __init__(self, licenses, communities, file_types, target_audiences):
+        self.licenses = frozenset(licenses)
+        self.communities = frozenset(communities)
+        self.file_types = frozenset(file_types)
+        self.target_audiences = frozenset(target_audiences)
+        self.media_types = frozenset(global_media_types)
+        self.proficiency_levels = frozenset(global_proficiency_levels)
+
+    @classmethod
+    def load(cls, cache_path=global_vocabulary_cache):
+        # Loads the vocabularies from the snapshot or, if it is missing or outdated, from the resource files.
+        # Expects: The path of the snapshot file.
+        # Returns: A VocabularyRegistry.
+        source_mtimes = cls.source_mtimes()
+        snapshot = cls.read_snapshot(cache_path)
+        if snapshot is not None and snapshot['mtimes'] == source_mtimes:
+            return cls(**snapshot['vocabularies'])
+
+        vocabularies = {
+            'licenses': read_license_file(),
+            'communities': read_communities_list()["subsidiaries"],
+            'file_types': read_data_formats_file(),
+            'target_audiences': read_target_audience_file()
+        }
+        registry = cls(**vocabularies)
+        cls.write_snapshot(cache_path, source_mtimes, registry)
+        return registry
+
+    def version(self):
+        # Calculates a hash of all vocabularies, which changes as soon as any vocabulary changes.
+        # Expects: None.
+        # Returns: The hash as a hexadecimal string.
+        digest = hashlib.blake2b(digest_size=16)
+        for vocabulary in (self.licenses, self.communities, self.file_types, self.target_audiences,
+                           self.media_types, self.proficiency_levels):
+            digest.update("\n".join(sorted(vocabulary)).encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def source_mtimes():
+        # Collects the modification times of all resource files the vocabularies are read from.
+        # Expects: None.
+        # Returns: A dictionary with the vocabulary names as keys and the modification times in ns as values.
+        return {name: os.stat(path).st_mtime_ns for name, path in global_vocabulary_sources.items()}
+
+    @staticmethod
+    def read_snapshot(cache_path):
+        # Reads the pickled snapshot of the vocabularies.
+        # Expects: The path of the snapshot file.
+        # Returns: The snapshot as a dictionary or None if it does not exist or cannot be read.
+        try:
+            with open(cache_path, 'rb') as file:
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    @staticmethod
+    def write_snapshot(cache_path, source_mtimes, registry):
+        # Writes the vocabularies read from the resource files to the snapshot file. A resources directory that is
+        # not writable only disables the snapshot.
+        # Expects: - The path of the snapshot file.
+        #          - The modification times of the resource files.
+        #          - The VocabularyRegistry to be stored.
+        # Returns: None.
+        snapshot = {
+            'mtimes': source_mtimes,
+            'vocabularies': {
+                'licenses': registry.licenses,
+                'communities': registry.communities,
+                'file_types': registry.file_types,
+                'target_audiences': registry.target_audiences
+            }
+        }
+        try:
+            with open(cache_path, 'wb') as file:
+                pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass
+
+
+def get_vocabulary():
+    # Returns the shared VocabularyRegistry and loads it on first use.
+    # Expects: None.
+    # Returns: A VocabularyRegistry.
+    global global_vocabulary
+    if global_vocabulary is None:
+        global_vocabulary = VocabularyRegistry.load()
+    return global_vocabulary
+
+
 def read_csv(path):
     # Reads a csv-file into a pandas dataframe.
     # Expects: The path to the csv-file.
     # Returns: A pandas dataframe with the data from the csv-file.
+    import pandas as pd
     try:
-        file = pd.read_csv(path)
+        file = pd.read_csv(path, dtype=str)
         return file
     except FileNotFoundError:
         print("The file could not be found, please check the provided path!")
 
 
+def read_csv_rows(path):
+    # Reads a csv-file with the csv-module into a dictionary of columns, which is much faster for small files than
+    # importing pandas. The file is read like read_csv and fill_empty_cells do: blank lines are skipped, missing cells
+    # and the values pandas reads as missing, like 'n/a' or 'NULL', become empty strings and repeated column names get
+    # a number appended. Rows with more cells than column names raise a ValueError, as pandas reads them differently.
+    # Expects: The path to the csv-file.
+    # Returns: A dictionary with the column names as keys and lists of strings as values.
+    try:
+        with open(path, 'r', newline="", encoding='utf-8-sig') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError("No columns to parse from file")
+            names = unique_column_names(header)
+            columns = [[] for _ in names]
+            for row in reader:
+                if not row or (len(row) == 1 and not row[0].strip()):
+                    continue
+                if len(row) > len(names):
+                    raise ValueError(f"Error tokenizing data. Expected {len(names)} fields in line "
+                                     f"{reader.line_num}, saw {len(row)}")
+                row.extend([""] * (len(names) - len(row)))
+                for cells, cell in zip(columns, row):
+                    cells.append("" if cell in global_missing_values else cell)
+        return dict(zip(names, columns))
+    except FileNotFoundError:
+        print("The file could not be found, please check the provided path!")
+
+
+def unique_column_names(header):
+    # Appends a number to repeated column names like pandas does, e.g. 'Title', 'Title.1'.
+    # Expects: A list of column names.
+    # Returns: A list of unique column names.
+    names = []
+    for name in header:
+        unique, number = name, 0
+        while unique in names:
+            number += 1
+            unique = f"{name}.{number}"
+        names.append(unique)
+    return names
+
+
+class MappedCsv:
+    # A csv-file mapped into memory. Only the boundaries of the rows are found when the file is opened, by searching
+    # the map for line breaks and quotes. Like the csv module and pandas, a quote only starts a quoted cell at the start
+    # of a cell, quotes within an unquoted cell are part of its value. The cells of a column are decoded into strings when a check asks for the
+    # column, so columns no check inspects, like long descriptions, are never copied out of the map. The cells are
+    # read like read_csv_rows does, but rows with more cells than column names only raise a ValueError when their
+    # cells are decoded.
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise
+        self.bounds = self.scan(self.buffer)
+        if not self.bounds:
+            self.close()
+            raise ValueError("No columns to parse from file")
+        header = self.split_row(self.buffer[self.bounds[0]:self.bounds[1]])
+        self.columns = unique_column_names([name.decode('utf-8') for name in header])
+        self.positions = {column: position for position, column in enumerate(self.columns)}
+        del self.bounds[:2]
+        self.cells = dict()
+
+    @staticmethod
+    def scan(buffer):
+        # Finds the start and the end of every row that is not blank. Line breaks within quoted cells belong to the
+        # row. A quote opens a quoted cell at the start of the row, after a comma or, as a doubled quote, right after
+        # the closing quote of a quoted cell.
+        # Expects: The mapped csv-file.
+        # Returns: An array with the start and the end of every row, one after the other.
+        find = buffer.find
+        size = len(buffer)
+        bounds = array('q')
+        position = 3 if buffer[:3] == b"\xef\xbb\xbf" else 0
+        while position < size:
+            end = find(b"\n", position)
+            if end == -1:
+                end = size
+            closing = -2
+            quote = find(b'"', position, end)
+            while quote != -1:
+                if quote != position and quote != closing + 1 and buffer[quote - 1] != 44:
+                    quote = find(b'"', quote + 1, end)
+                    continue
+                closing = find(b'"', quote + 1)
+                if closing == -1:
+                    raise ValueError("EOF inside string")
+                if closing > end:
+                    end = find(b"\n", closing)
+                    if end == -1:
+                        end = size
+                quote = find(b'"', closing + 1, end)
+            row_end = end - 1 if end > position and buffer[end - 1] == 13 else end
+            if find(b",", position, row_end) != -1 or MappedCsv.split_row(buffer[position:row_end])[0].strip():
+                bounds.append(position)
+                bounds.append(row_end)
+            position = end + 1
+        return bounds
+
+    @staticmethod
+    def split_row(row):
+        # Splits a row into its cells. Quotes around a cell are removed and doubled quotes within it become one. A
+        # quote only opens a quoted cell at the start of a cell, like in scan, and the rest of a cell after its
+        # closing quote is kept.
+        # Expects: The bytes of a row without the line break.
+        # Returns: A list of bytes.
+        if b'"' not in row:
+            return row.split(b",")
+        cells = []
+        find = row.find
+        position = 0
+        while True:
+            cell = b""
+            if row.startswith(b'"', position):
+                position += 1
+                while True:
+                    closing = find(b'"', position)
+                    if closing == -1:
+                        cell += row[position:]
+                        position = len(row)
+                        break
+                    cell += row[position:closing]
+                    position = closing + 1
+                    if not row.startswith(b'"', position):
+                        break
+                    cell += b'"'
+                    position += 1
+            comma = find(b",", position)
+            if comma == -1:
+                cells.append(cell + row[position:])
+                return cells
+            cells.append(cell + row[position:comma])
+            position = comma + 1
+
+    def __len__(self):
+        return len(self.bounds) // 2
+
+    def __contains__(self, column):
+        return column in self.positions
+
+    def __getitem__(self, column):
+        return self.decode([column])[0]
+
+    def decode(self, columns, presence=()):
+        # Decodes the cells of several columns in a single pass over the rows. Decoded columns are kept for later
+        # calls. Of the columns in presence only whether a cell is empty is needed, so their cells are not decoded
+        # and all cells that are not empty become global_undecoded_cell.
+        # Expects: - A list of column names.
+        #          - The column names of the list whose values are not inspected.
+        # Returns: A list with a list of strings for every column.
+        decoded = [column for column in columns if column not in self.cells and column not in presence]
+        indicated = [column for column in columns if column not in self.cells and column in presence]
+        values = self.read_columns(decoded, indicated) if decoded or indicated else []
+        self.cells.update(zip(decoded, values))
+        indicators = dict(zip(indicated, values[len(decoded):]))
+        return [self.cells[column] if column in self.cells else indicators[column] for column in columns]
+
+    def read_columns(self, decoded, indicated):
+        # Reads the cells of several columns in a single pass over the rows.
+        # Expects: - A list of column names whose cells are decoded.
+        #          - A list of column names whose cells are only tested for being empty.
+        # Returns: A list with a list of strings for every column, the decoded columns first.
+        positions = [self.positions[column] for column in decoded + indicated]
+        values = [[] for _ in positions]
+        count = len(decoded)
+        width = len(self.columns)
+        buffer = self.buffer
+        bounds = iter(self.bounds)
+        for row, (start, end) in enumerate(zip(bounds, bounds)):
+            cells = self.split_row(buffer[start:end])
+            if len(cells) > width:
+                raise ValueError(f"Error tokenizing data. Expected {width} fields in row {row + 1}, saw {len(cells)}")
+            for number, (position, column_cells) in enumerate(zip(positions, values)):
+                cell = cells[position] if position < len(cells) else b""
+                if number < count:
+                    cell = cell.decode('utf-8')
+                    column_cells.append("" if cell in global_missing_values else cell)
+                else:
+                    column_cells.append("" if cell in global_missing_bytes else global_undecoded_cell)
+        return values
+
+    def drop_rows(self, count):
+        # Removes the first rows, e.g. additional header lines.
+        # Expects: The number of rows.
+        # Returns: None.
+        del self.bounds[:2 * count]
+        self.cells.clear()
+
+    def keep_rows(self, positions):
+        # Removes all rows except the ones at the given positions, e.g. a sample.
+        # Expects: A sorted list of positions of rows.
+        # Returns: None.
+        bounds = array(self.bounds.typecode)
+        for position in positions:
+            bounds.extend(self.bounds[2 * position:2 * position + 2])
+        self.bounds = bounds
+        self.cells.clear()
+
+    def close(self):
+        self.buffer.close()
+        self.file.close()
+
+
+def read_csv_chunks(path, chunk_size):
+    # Reads a csv-file chunk by chunk into pandas dataframes. The index of each chunk continues the index of the
+    # previous one, so it always refers to the row in the whole file.
+    # Expects: - The path to the csv-file.
+    #          - The number of rows per chunk.
+    # Returns: A generator of pandas dataframes.
+    import pandas as pd
+    try:
+        with pd.read_csv(path, dtype=str, chunksize=chunk_size) as reader:
+            yield from reader
+    except FileNotFoundError:
+        print("The file could not be found, please check the provided path!")
+
+
 def remove_header_lines(header_lines, data_frame):
     # Removes additional header lines between the data-labels and the data.
     # Expects: - The number of header lines except the column names.
@@ -89,6 +602,323 @@ def remove_header_lines(header_lines, data_frame):
         data_frame.drop(index=i, inplace=True)
 
 
+def remove_row_header_lines(header_lines, columns):
+    # Removes additional header lines between the data-labels and the data of a csv-file read by read_csv_rows or
+    # mapped by MappedCsv.
+    # Expects: - The number of header lines except the column names.
+    #          - A reference to the dictionary of columns or the MappedCsv the lines are to be deleted from.
+    # Returns: No explicit return-value or object, the lines will be deleted from the referenced columns in place instead.
+    global global_header_lines
+    global_header_lines = header_lines
+    if header_lines > row_count(columns):
+        raise KeyError(f"[{row_count(columns)}] not found in axis")
+    if isinstance(columns, MappedCsv):
+        columns.drop_rows(header_lines)
+        return
+    for cells in columns.values():
+        del cells[:header_lines]
+
+
+def row_count(dataframe):
+    # Counts the data rows of a pandas dataframe, a dictionary of columns read by read_csv_rows or a MappedCsv.
+    # Expects: A pandas dataframe, a dictionary of columns or a MappedCsv.
+    # Returns: The number of rows as an integer.
+    if isinstance(dataframe, dict):
+        return len(next(iter(dataframe.values()), []))
+    return len(dataframe)
+
+
+def column_values(dataframe, column):
+    # Returns the cells of a column of a pandas dataframe, a dictionary of columns read by read_csv_rows or a
+    # MappedCsv.
+    # Expects: - A pandas dataframe, a dictionary of columns or a MappedCsv.
+    #          - The name of the column.
+    # Returns: A sequence of strings.
+    values = dataframe[column]
+    return values if isinstance(values, list) else values.to_numpy(dtype=object)
+
+
+def load_columns(dataframe, columns, presence=()):
+    # Returns the cells of several columns like column_values. The columns of a MappedCsv are decoded in a single pass
+    # and of the columns in presence only whether a cell is empty is read, the other cells are global_undecoded_cell.
+    # Expects: - A pandas dataframe, a dictionary of columns or a MappedCsv.
+    #          - A list of column names.
+    #          - The column names of the list whose values are not inspected.
+    # Returns: A list with a sequence of strings for every column.
+    if isinstance(dataframe, MappedCsv):
+        return dataframe.decode(columns, presence)
+    return [column_values(dataframe, column) for column in columns]
+
+
+def remove_chunk_header_lines(header_lines, chunk):
+    # Removes the additional header lines from a chunk of the csv-file. Only the first chunk(s) contain header lines.
+    # Expects: - The number of header lines except the column names.
+    #          - A reference to the chunk the lines are to be deleted from.
+    # Returns: No explicit return-value or object, the lines will be deleted from the referenced chunk in place instead.
+    global global_header_lines
+    global_header_lines = header_lines
+    chunk.drop(index=[i for i in chunk.index if i < header_lines], inplace=True)
+
+
+def line_number(index):
+    # Calculates the line number in the csv-file of a data row.
+    # Expects: The position of the row in the checked series.
+    # Returns: The line number as an integer.
+    return index + global_row_offset + global_header_lines + global_line_offset
+
+
+class CheckStatistics:
+    # Holds the measurements of a single call of a check-function.
+
+    def __init__(self, column, checker, rows, values):
+        self.column = column
+        self.checker = checker
+        self.rows = rows
+        self.values = values
+        self.errors = 0
+        self.regex_calls = 0
+        self.start = 0.0
+        self.seconds = 0.0
+        self.process = os.getpid()
+
+    def merge(self, other):
+        # Adds the measurements of another call on a further partition of the same column.
+        # Expects: A CheckStatistics.
+        # Returns: None.
+        self.rows += other.rows
+        self.values += other.values
+        self.errors += other.errors
+        self.regex_calls += other.regex_calls
+        self.seconds += other.seconds
+
+    def as_dict(self):
+        return {
+            'column': self.column,
+            'checker': self.checker,
+            'seconds': self.seconds,
+            'rows': self.rows,
+            'values': self.values,
+            'errors': self.errors,
+            'regex_calls': self.regex_calls
+        }
+
+
+def add_check_hook(hook):
+    # Registers a function that is called with the CheckStatistics after every call of a check-function. As long as
+    # no hook is registered the check-functions are not measured.
+    # Expects: A function accepting a CheckStatistics.
+    # Returns: None.
+    global_check_hooks.append(hook)
+
+
+def remove_check_hook(hook):
+    # Unregisters a function registered with add_check_hook.
+    # Expects: The registered function.
+    # Returns: None.
+    global_check_hooks.remove(hook)
+
+
+class CheckProgress:
+    # The progress of a running check: the rows checked so far, the errors per Attribute found so far and, if the
+    # number of rows of the file is known, the estimated remaining time. Is passed to the progress hooks. A check
+    # resumed from a checkpoint starts at the rows checked before, which do not count for the rows per second.
+
+    def __init__(self, total_rows=None, resumed_rows=0):
+        self.total_rows = total_rows
+        self.resumed_rows = resumed_rows
+        self.rows = resumed_rows
+        self.errors = dict()
+        self.start = time.perf_counter()
+        self.finished = False
+
+    def seconds(self):
+        return time.perf_counter() - self.start
+
+    def rows_per_second(self):
+        # Returns the rows checked per second since the start or the resumption of the check.
+        seconds = self.seconds()
+        return (self.rows - self.resumed_rows) / seconds if seconds > 0 else 0.0
+
+    def remaining_seconds(self):
+        # Estimates the remaining time from the rows per second so far.
+        # Expects: None.
+        # Returns: The remaining seconds or None if the number of rows of the file is unknown.
+        rate = self.rows_per_second()
+        if self.total_rows is None or rate == 0:
+            return None
+        return max(self.total_rows - self.rows, 0) / rate
+
+    def update(self, rows, errors, finished=False):
+        # Records the progress and calls all progress hooks.
+        # Expects: - The number of rows checked so far.
+        #          - A dictionary with the Attributes as keys and the numbers of errors so far as values.
+        #          - Whether the check is finished.
+        # Returns: None.
+        self.rows = rows
+        self.errors = errors
+        self.finished = finished
+        for hook in list(global_progress_hooks):
+            hook(self)
+
+
+class ProgressPrinter:
+    # A progress hook printing the rows checked so far, the rows per second, the estimated remaining time and the
+    # errors per Attribute to stderr, at most once per interval.
+
+    def __init__(self, interval=1.0, file=None):
+        self.interval = interval
+        self.file = file if file is not None else sys.stderr
+        self.printed = None
+
+    def __call__(self, progress):
+        now = time.perf_counter()
+        if not progress.finished and self.printed is not None and now - self.printed < self.interval:
+            return
+        self.printed = now
+        terminal = self.file.isatty()
+        rows = f"{progress.rows}" if progress.total_rows is None else f"{progress.rows}/{progress.total_rows}"
+        remaining = progress.remaining_seconds()
+        eta = ""
+        if remaining is not None and not progress.finished:
+            eta = f", ETA {time.strftime('%H:%M:%S', time.gmtime(remaining))}"
+        errors = ", ".join(f"{column} {count}" for column, count in progress.errors.items() if count)
+        start = "\r" if terminal else ""
+        print(f"{start}{rows} rows, {progress.rows_per_second():.0f} rows/s{eta}, errors: {errors or 'none'}",
+              end="" if terminal and not progress.finished else "\n", file=self.file, flush=True)
+
+
+def add_progress_hook(hook):
+    # Registers a function that is called with the CheckProgress while a file is checked: after every chunk in the
+    # stream mode and every global_progress_step rows otherwise.
+    # Expects: A function accepting a CheckProgress.
+    # Returns: None.
+    global_progress_hooks.append(hook)
+
+
+def remove_progress_hook(hook):
+    # Unregisters a function registered with add_progress_hook.
+    # Expects: The registered function.
+    # Returns: None.
+    global_progress_hooks.remove(hook)
+
+
+def count_regex_calls(calls=1):
+    # Counts calls of regular expressions for the statistics of the check-function currently measured.
+    # Expects: The number of calls.
+    # Returns: None.
+    if global_check_statistics is not None:
+        global_check_statistics.regex_calls += calls
+
+
+def count_values(column, series):
+    # Counts the values in a column, counting every element of multi-value cells.
+    # Expects: - The name of the column.
+    #          - A series from a pandas dataframe.
+    # Returns: The number of values as an integer.
+    import pandas as pd
+    strings = pd.Series(series.to_numpy(dtype=object), dtype=object)
+    filled = strings[strings != ""]
+    if column in global_multi_value_columns:
+        return len(filled) + int(filled.str.count(global_split_pattern).sum())
+    return len(filled)
+
+
+def checker_name(checker):
+    # Returns the name of a check-function, which may also be a partial function.
+    # Expects: A check-function.
+    # Returns: The name as a string.
+    if isinstance(checker, partial):
+        return checker.func.__name__
+    return checker.__name__
+
+
+def measure_checker(column, checker, series):
+    # Runs a check-function and measures it.
+    # Expects: - The name of the column.
+    #          - The check-function.
+    #          - A series from a pandas dataframe.
+    # Returns: A tuple with the list of errors of the check-function and its CheckStatistics.
+    global global_check_statistics
+    statistics = CheckStatistics(column, checker_name(checker), len(series), count_values(column, series))
+    global_check_statistics = statistics
+    statistics.start = time.perf_counter()
+    try:
+        errors = checker(series)
+    finally:
+        statistics.seconds = time.perf_counter() - statistics.start
+        global_check_statistics = None
+    statistics.errors = len(errors)
+    return errors, statistics
+
+
+def call_check_hooks(statistics):
+    for hook in global_check_hooks:
+        hook(statistics)
+
+
+def run_checker(column, checker, series):
+    # Runs a check-function and passes its measurements to the registered hooks.
+    # Expects: - The name of the column.
+    #          - The check-function.
+    #          - A series from a pandas dataframe.
+    # Returns: The list of errors of the check-function.
+    if not global_check_hooks:
+        return checker(series)
+    errors, statistics = measure_checker(column, checker, series)
+    call_check_hooks(statistics)
+    return errors
+
+
+class CheckProfiler:
+    # Collects the CheckStatistics of all check-functions as a hook and writes them as a summary table, as JSON or as
+    # a trace in the Chrome trace event format, which can be opened in chrome://tracing or https://ui.perfetto.dev.
+
+    def __init__(self):
+        self.statistics = []
+
+    def __call__(self, statistics):
+        self.statistics.append(statistics)
+
+    def summary(self):
+        # Sums up the statistics of every column over all chunks and partitions.
+        # Expects: None.
+        # Returns: A list of CheckStatistics, one per column.
+        columns = dict()
+        for statistics in self.statistics:
+            if statistics.column not in columns:
+                columns[statistics.column] = CheckStatistics(statistics.column, statistics.checker, 0, 0)
+            columns[statistics.column].merge(statistics)
+        return list(columns.values())
+
+    def print_summary(self, file=sys.stderr):
+        print(f"{'column':<18}{'checker':<38}{'seconds':>10}{'rows':>10}{'values':>10}{'errors':>10}{'regex':>12}",
+              file=file)
+        for statistics in self.summary():
+            print(f"{statistics.column:<18}{statistics.checker:<38}{statistics.seconds:>10.3f}{statistics.rows:>10}"
+                  f"{statistics.values:>10}{statistics.errors:>10}{statistics.regex_calls:>12}", file=file)
+
+    def write_json(self, file_name):
+        with open(file_name, 'w') as output:
+            json.dump({
+                'summary': [statistics.as_dict() for statistics in self.summary()],
+                'calls': [statistics.as_dict() for statistics in self.statistics]
+            }, output, indent=2)
+
+    def write_chrome_trace(self, file_name):
+        events = [{
+            'name': statistics.column,
+            'cat': statistics.checker,
+            'ph': 'X',
+            'ts': statistics.start * 1e6,
+            'dur': statistics.seconds * 1e6,
+            'pid': statistics.process,
+            'tid': statistics.process,
+            'args': statistics.as_dict()
+        } for statistics in self.statistics]
+        with open(file_name, 'w') as output:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, output)
+
+
 def fill_empty_cells(data_frame):
     # Fills all empty cells in the dataframe with empty strings to prevent errors
     # Expects: A reference to a pandas dataframe.
@@ -100,424 +930,2153 @@ def split_into_list(string):
     # Splits the given string at the delimiter '*' into list elements.
     # Expects: A string containing at least two items split by a '*'.
     # Returns: A list of strings.
-    return re.split(r'\s\*\s', string)
-
-
-def check_authors(authors):
-    # Checks the column 'Authors' according to the rules of the DIF.
-    # Expects: A series from a pandas dataframe containing the authors strings.
-    # Returns: A list of errors with line number and type of error.
-    author_errors = []
-    for index, author in enumerate(authors):
-        if author == "":
-            author_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: Mandatory attribute 'Author' is missing.")
-            continue
-        if r'\*' in author:
-            author_list = split_into_list(author)
-            for auth in author_list:
-                if check_author_format(auth):
-                    author_errors.append(f"Line {index + global_header_lines + global_line_offset}: Wrong name format.")
-        else:
-            if check_author_format(author):
-                author_errors.append(f"Line {index + global_header_lines + global_line_offset}: Wrong name format.")
-    return author_errors
-
-
-def check_author_format(author):
-    # Check the format of a name with a regular expression.
-    # Expects: A string.
-    # Returns: False if the string matches the constraints of the DIF and True if it doesn't.
-    if re.search(
-            r"[\wäöüÄÖÜß-]+,\s[\wäöüÄÖÜß-]+(?:\s?:\s?\{\S*}|)+(?:$|\s\*\s[\wäöüÄÖÜß-]+,\s[\wäöüÄÖÜß-]+(?:\s?:\s?\{\S*}|)+)*",
-            author) is not None or re.search(
-        r"^[\S\s]*\s:\s\{organization", author) is not None or re.search("^n/a$", author) is not None:
-        return False
-    else:
-        return True
-
-
-def check_licenses(licenses):
-    # Checks the column 'License' according to the rules of the DIF.
-    # Expects: A series from a pandas dataframe containing the license strings.
-    # Returns: A list of errors with line number and type of error.
-    license_list = read_license_file()
-    license_errors = []
+    count_regex_calls()
+    return global_split_pattern.split(string)
+
+
+def vectorized_strings(series):
+    # Converts a column into a series of python strings indexed by the position of the rows, so the pandas string
+    # methods evaluate the precompiled patterns with the re-module.
+    # Expects: A series from a pandas dataframe.
+    # Returns: A pandas series with dtype object.
+    import pandas as pd
+    return pd.Series(series.to_numpy(dtype=object), dtype=object)
+
+
+def evaluate_distinct(strings, rule):
+    # Evaluates a rule only once for every distinct value of a column and maps the results back onto the rows. Most
+    # columns of the DIF only contain a few distinct values, so this saves most of the regular expression calls.
+    # Expects: - A pandas series of strings.
+    #          - A function that evaluates the rule on a pandas series of strings and returns a series of the results.
+    # Returns: A pandas series with the results of the rule and the index of the strings.
+    import pandas as pd
+    codes, distinct = pd.factorize(strings)
+    results = rule(pd.Series(distinct, dtype=object)).to_numpy()
+    return pd.Series(results[codes], index=strings.index)
+
+
+def failing_rows(failures, message):
+    # Pairs the positions of all rows that failed a rule with the message of the rule. A row is paired once for every
+    # time it failed the rule.
+    # Expects: - A pandas series of booleans or counts of failures with the positions of the rows as index.
+    #          - The error message of the rule.
+    # Returns: A list of tuples with the position of the row and the message.
+    return [(position, message) for position in failures.index.repeat(failures.to_numpy(dtype=int)).tolist()]
+
+
+def collect_errors(*failures):
+    # Turns the failing rows of all rules of a column into errors. The errors are sorted by line and within a line by
+    # the order of the rules, like the check-functions produce them row by row.
+    # Expects: Lists of tuples with the position of the row and the message, one per rule.
+    # Returns: A ColumnErrors with the errors of the column.
+    rows = sorted((failure for rule in failures for failure in rule), key=lambda failure: failure[0])
+    errors = ColumnErrors()
+    message_ids = dict()
+    for position, message in rows:
+        if message not in message_ids:
+            message_ids[message] = message_id(message)
+        errors.append(line_number(position), message_ids[message])
+    return errors
 
-    for index, license_id in enumerate(licenses):
-        if license_id == "":
-            license_errors.append(f"Line {index + global_header_lines + global_line_offset}: License is missing.")
-            continue
-        if license_id not in license_list:
-            license_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: Provided License is not part of the list from 'https://spdx.org/licenses/' or is in a wrong format.")
-    return license_errors
 
+def split_elements(strings):
+    # Splits all cells of a column at the delimiter '*' and puts every element into a row of its own.
+    # Expects: A pandas series of strings.
+    # Returns: A pandas series of strings with the index of the original rows.
+    count_regex_calls(len(strings))
+    return strings.str.split(global_split_pattern, regex=True).explode()
+
+
+def mismatches(pattern):
+    # Creates a rule, which fails for all strings that do not contain a match of the pattern.
+    # Expects: A precompiled pattern.
+    # Returns: A function that evaluates the rule on a pandas series of strings.
+    def rule(strings):
+        count_regex_calls(len(strings))
+        return ~strings.str.contains(pattern)
+    return rule
+
+
+def remove_parts(pattern):
+    # Creates a function, which removes all matches of a pattern from strings, like the role of a community.
+    # Expects: A precompiled pattern.
+    # Returns: A function that removes the matches from a pandas series of strings.
+    def remove(strings):
+        count_regex_calls(len(strings))
+        return strings.str.replace(pattern, '', regex=True)
+    return remove
+
+
+def compile_vectorized_rule(rule, vocabulary):
+    # Compiles a rule of the rule table like compile_rule, but into a function evaluating the rule on a whole series.
+    # Expects: - A tuple of the kind of the rule ('pattern' or 'vocabulary'), the precompiled pattern or the name of
+    #            the vocabulary, the error message and for vocabularies optionally a pattern of parts of the value that
+    #            are removed before the lookup.
+    #          - A VocabularyRegistry.
+    # Returns: A tuple with the function, which returns a series of booleans that are True for the failing values, and
+    #          the error message.
+    kind, target, message, *remove = rule
+    if kind == 'pattern':
+        return mismatches(target), message
+    words = getattr(vocabulary, target)
+    if remove:
+        remove_part = remove_parts(remove[0])
+        return (lambda strings: ~remove_part(strings).isin(words)), message
+    return (lambda strings: ~strings.isin(words)), message
+
+
+def vectorized_rule_failures(cells, split, once_per_cell, rules):
+    # Evaluates the rules of a column on the elements of all cells. Like compile_column, a cell is split into elements
+    # only if it contains the split string, and every element is checked against every rule in the order of the
+    # elements, or with once_per_cell every rule fails at most once per cell.
+    # Expects: - A pandas series of non-empty strings.
+    #          - The split string of the column or None.
+    #          - Whether every rule fails at most once per cell.
+    #          - A list of tuples with the compiled rule and its message.
+    # Returns: A list of tuples with the position of the row and the message in the order of the rows and the
+    #          elements.
+    import pandas as pd
+    elements = cells
+    if split is not None:
+        divided = cells.str.contains(split, regex=False)
+        elements = pd.concat([cells[~divided], split_elements(cells[divided])]).sort_index(kind='stable')
+    if once_per_cell:
+        return [failure for fails, message in rules
+                for failure in failing_rows(evaluate_distinct(elements, fails).groupby(level=0, sort=True).any(),
+                                            message)]
+    positions = elements.index.to_numpy()
+    ordinals = elements.groupby(level=0, sort=False).cumcount().to_numpy()
+    failures = []
+    for number, (fails, message) in enumerate(rules):
+        failed = evaluate_distinct(elements, fails).to_numpy(dtype=bool)
+        failures.extend((position, ordinal, number, message)
+                        for position, ordinal in zip(positions[failed].tolist(), ordinals[failed].tolist()))
+    failures.sort(key=lambda failure: failure[:3])
+    return [(position, message) for position, _, _, message in failures]
+
+
+def compile_vectorized_column(specification, vocabulary):
+    # Compiles the specification of a column from the rule table into a check-function, which evaluates every rule on
+    # the whole column at once with pandas string operations. The rules of every distinct value are evaluated once.
+    # Expects: - A dictionary from the rule table.
+    #          - A VocabularyRegistry.
+    # Returns: A function, which checks a series from a pandas dataframe and returns a ColumnErrors.
+    empty_message = specification['empty']
+    format_pattern, format_message = specification.get('format', (None, None))
+    split = specification.get('split')
+    once_per_cell = specification.get('once_per_cell', False)
+    rules = [compile_vectorized_rule(rule, vocabulary) for rule in specification['rules']]
+
+    def check(series):
+        strings = vectorized_strings(series)
+        empty = strings == ""
+        failures = [failing_rows(empty, empty_message)]
+        cells = strings[~empty]
+        if format_pattern is not None:
+            wrong_format = evaluate_distinct(cells, mismatches(format_pattern))
+            failures.append(failing_rows(wrong_format, format_message))
+            cells = cells[~wrong_format]
+        if rules:
+            failures.append(vectorized_rule_failures(cells, split, once_per_cell, rules))
+        return collect_errors(*failures)
+    return check
+
+
+def get_vectorized_plan():
+    # Returns the vectorized check-functions of all columns and compiles them from the rule table on first use.
+    # Expects: None.
+    # Returns: A dictionary with the Attributes as keys and the check-functions as values.
+    global global_vectorized_plan
+    if global_vectorized_plan is None:
+        vocabulary = get_vocabulary()
+        global_vectorized_plan = {specification['column']: compile_vectorized_column(specification, vocabulary)
+                                  for specification in global_rule_table}
+    return global_vectorized_plan
+
+
+def check_vectorized_column(column, series):
+    # Checks a single column with its vectorized check-function.
+    # Expects: - The name of the column.
+    #          - A series from a pandas dataframe.
+    # Returns: A ColumnErrors with the errors of the column.
+    return get_vectorized_plan()[column](series)
+
+
+global_rule_table = [
+    {'column': 'Authors', 'code': 'AUTHORS', 'required': True,
+     'absent': "The mandatory Attribute 'Authors' is missing from every item!",
+     'empty': "Mandatory attribute 'Author' is missing.",
+     'split': r'\*',
+     'rules': [('pattern', global_author_pattern, "Wrong name format.")],
+     'catalogue': [('identifier', "The author has a different identifier in line {reference}.")]},
+    {'column': 'License', 'code': 'LICENSE', 'required': True,
+     'absent': "The mandatory Attribute 'License' is missing from every item!",
+     'empty': "License is missing.",
+     'rules': [('vocabulary', 'licenses',
+                "Provided License is not part of the list from 'https://spdx.org/licenses/' or is in a wrong format.")]},
+    {'column': 'Link', 'code': 'LINK', 'required': True,
+     'absent': "The mandatory Attribute 'Link' is missing from every item!",
+     'empty': "Link is missing.",
+     'rules': [('pattern', global_link_pattern, "Link is not in a valid format.")],
+     'deep': [('status', 'links', "The link could not be resolved.")],
+     'catalogue': [('duplicate', "The link is also used in line {reference}.")]},
+    {'column': 'Title', 'code': 'TITLE', 'required': True,
+     'absent': "The mandatory Attribute 'Title' is missing from every item!",
+     'empty': "Title is missing.",
+     'rules': [],
+     'catalogue': [('duplicate', "The title is also used in line {reference}."),
+                   ('similar', "The title is similar to the title in line {reference}.")]},
+    {'column': 'Description', 'code': 'DESCRIPTION', 'required': False,
+     'absent': "It is recommended to provide a description for every item!",
+     'empty': "It is recommended to provide a description for a resource.",
+     'rules': [],
+     'catalogue': [('similar', "The description is similar to the description in line {reference}.")]},
+    {'column': 'Community', 'code': 'COMMUNITY', 'required': False,
+     'absent': "It is recommended to provide information about recommending and supporting communities!",
+     'empty': "It is recommended to provide a Community, either as supporting or recommending entity.",
+     'split': r'\*',
+     'rules': [('pattern', global_community_pattern, "The provided format for the community contains errors."),
+               ('vocabulary', 'communities',
+                "The provided name does not match any name from the subsidiaries list. Please check if the name is correct. If it is you can ignore this warning.",
+                global_community_role_pattern)]},
+    {'column': 'Discipline', 'code': 'DISCIPLINE', 'required': False,
+     'absent': "It is recommended to provide at least one relevant discipline listed in https://skohub.io/dini-ag-kim/hochschulfaechersystematik/heads/master/w3id.org/kim/hochschulfaechersystematik/scheme.html",
+     'empty': "It is recommended to provide at least one relevant discipline as a link listed in https://skohub.io/dini-ag-kim/hochschulfaechersystematik/heads/master/w3id.org/kim/hochschulfaechersystematik/scheme.html .",
+     'split': r'\*',
+     'rules': [('pattern', global_discipline_pattern, "The provided format is not of the type xsd:anyURI.")],
+     'deep': [('scheme', 'disciplines', "The provided discipline is not part of the Hochschulfächersystematik.")]},
+    {'column': 'MediaType', 'code': 'MEDIA_TYPE', 'required': False,
+     'absent': "It is recommended to provide media types for learning resources.",
+     'empty': "It is recommended to provide a media type for learning resources",
+     'split': '*',
+     'rules': [('vocabulary', 'media_types', "The provided media type is not in the DIF picklist.")]},
+    {'column': 'ProficiencyLevel', 'code': 'PROFICIENCY_LEVEL', 'required': False,
+     'absent': "It is recommended to provide proficiency levels for learning resources.",
+     'empty': "It is recommended to provide at least one proficiency level for learning resources.",
+     'split': '*',
+     'rules': [('vocabulary', 'proficiency_levels', "The provided proficiency level is not in the DIF picklist.")]},
+    {'column': 'PublicationDate', 'code': 'PUBLICATION_DATE', 'required': False,
+     'absent': "It is recommended to provide publication dates for learning resources.",
+     'empty': "It is recommended to provide a publication date for learning resources.",
+     'rules': [('pattern', global_date_pattern, "The provided publication date is not of the format xsd:date.")]},
+    {'column': 'FileFormat', 'code': 'FILE_FORMAT', 'required': False,
+     'absent': "It is recommended to provide the file formats of the resources.",
+     'empty': "It is recommended to provide the file format of a learning resource.",
+     'format': (global_file_format_pattern, "The provided file format is not formatted properly."),
+     'split': '',
+     'once_per_cell': True,
+     'rules': [('vocabulary', 'file_types', "The provided file format is not included in the picklist.")]},
+    {'column': 'TargetGroup', 'code': 'TARGET_GROUP', 'required': False,
+     'absent': "It is recommended to provide at least one target group for a learning resource.",
+     'empty': "It is recommended to provide at least one target group for a learning resource.",
+     'format': (global_target_group_pattern, "The provided target groups are not formatted properly."),
+     'split': '',
+     'once_per_cell': True,
+     'rules': [('vocabulary', 'target_audiences', "The provided target group is not included in the picklist.")]}
+]
+global_rule_plan = None
+global_vectorized_plan = None
+global_rule_memo_size = 65536
+global_catalogue_kinds = {'duplicate': 'DUPLICATE', 'similar': 'SIMILAR', 'identifier': 'CONFLICT'}
+
+
+def message_table(rule_table):
+    # Assigns an id and a stable code to every error message of the rule table. The code is the code of the column
+    # followed by the kind of the error: ABSENT for a missing column, MISSING for an empty cell, SYNTAX for a cell that
+    # is not formatted properly, INVALID for a value that does not match a pattern and UNKNOWN for a value that is not
+    # in a vocabulary or the discipline scheme and UNREACHABLE for a link that can not be resolved. The findings across
+    # rows are DUPLICATE, SIMILAR and CONFLICT for an author with different identifiers. Errors of required Attributes
+    # have the severity 'error', all others and all findings across rows 'warning'.
+    # Expects: The rule table.
+    # Returns: A tuple with a list of tuples with the Attribute, the severity, the code and the message, indexed by the
+    #          id of the message, a dictionary with the messages of errors of a line as keys and their ids as values
+    #          and a dictionary with the Attributes as keys and the ids of the messages of missing columns as values.
+    messages = []
+    line_ids = dict()
+    absent_ids = dict()
+    for specification in rule_table:
+        column, code = specification['column'], specification['code']
+        severity = "error" if specification['required'] else "warning"
+        absent_ids[column] = len(messages)
+        messages.append((column, severity, f"{code}_ABSENT", specification['absent']))
+        kinds = [('MISSING', specification['empty'])]
+        if 'format' in specification:
+            kinds.append(('SYNTAX', specification['format'][1]))
+        kinds.extend(('INVALID' if kind == 'pattern' else 'UNKNOWN', message)
+                     for kind, _, message, *_ in specification['rules'])
+        kinds.extend(('UNREACHABLE' if kind == 'status' else 'UNKNOWN', message)
+                     for kind, _, message in specification.get('deep', []))
+        for kind, message in kinds:
+            line_ids[message] = len(messages)
+            messages.append((column, severity, f"{code}_{kind}", message))
+        for kind, message in specification.get('catalogue', []):
+            line_ids[message] = len(messages)
+            messages.append((column, "warning", f"{code}_{global_catalogue_kinds[kind]}", message))
+    return messages, line_ids, absent_ids
+
+
+global_messages, global_message_ids, global_absent_message_ids = message_table(global_rule_table)
+global_record_fields = ('line', 'column', 'severity', 'code', 'message')
+
+
+def message_id(message):
+    # Returns the id of the message of an error of a line. Messages that are not part of the rule table are added to
+    # the table without Attribute and code.
+    # Expects: An error message.
+    # Returns: The id as an integer.
+    result = global_message_ids.get(message)
+    if result is None:
+        result = len(global_messages)
+        global_messages.append((None, "error", None, message))
+        global_message_ids[message] = result
+    return result
+
+
+def render_error(line, message, reference=0):
+    # Renders an error into the text of the report.
+    # Expects: - The line number or 0 if the error belongs to no line.
+    #          - The id of the message.
+    #          - The line number the message refers to, which replaces '{reference}' in the message, or 0.
+    # Returns: A string of the format 'Line N: message' or only the message.
+    text = global_messages[message][3]
+    if reference:
+        text = text.replace("{reference}", str(reference))
+    return f"Line {line}: {text}" if line else text
+
+
+class ColumnErrors:
+    # The errors of a column as two arrays, the line numbers and the ids of the messages in global_messages, so every
+    # error takes six bytes. The messages are only rendered into text when they are read, e.g. when the report is
+    # written. Errors that belong to no line, like missing columns, have the line number 0. The few errors that refer
+    # to another line, like duplicates, keep that line in a dictionary with the index of the error as key.
+    __slots__ = ('lines', 'messages', 'references')
+
+    def __init__(self):
+        self.lines = array('i')
+        self.messages = array('H')
+        self.references = dict()
+
+    def append(self, line, message, reference=0):
+        if reference:
+            self.references[len(self.lines)] = reference
+        self.lines.append(line)
+        self.messages.append(message)
+
+    def extend(self, other):
+        offset = len(self.lines)
+        self.references.update((index + offset, reference) for index, reference in other.references.items())
+        self.lines.extend(other.lines)
+        self.messages.extend(other.messages)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __getitem__(self, index):
+        return render_error(self.lines[index], self.messages[index], self.references.get(index, 0))
+
+    def __iter__(self):
+        if not self.references:
+            return map(render_error, self.lines, self.messages)
+        return (self[index] for index in range(len(self.lines)))
+
+
+def absent_errors(column):
+    # Creates the error of a column that is missing from the csv-file.
+    # Expects: The name of the column.
+    # Returns: A ColumnErrors with a single error.
+    errors = ColumnErrors()
+    errors.append(0, global_absent_message_ids[column])
+    return errors
 
-def check_link(link_list):
-    # Checks the column 'Link' according to the rules of the DIF.
-    # Expects: A series from a pandas dataframe containing the link strings.
-    # Returns: A list of errors with line number and type of error.
-    global global_header_lines
-    link_errors = []
 
-    for index, link in enumerate(link_list):
-        if link == "":
-            link_errors.append(f"Line {index + global_header_lines + global_line_offset}: Link is missing.")
+def count_error_codes(errors):
+    # Counts the errors per code without rendering or parsing any message.
+    # Expects: A dictionary with the Attributes as keys and ColumnErrors as values.
+    # Returns: A dictionary with the codes as keys and the number of errors as values.
+    counts = dict()
+    for column_errors in errors.values():
+        for message, count in Counter(column_errors.messages).items():
+            code = global_messages[message][2]
+            counts[code] = counts.get(code, 0) + count
+    return counts
+
+
+def compile_rule(rule, vocabulary):
+    # Compiles a rule of the rule table into a function, which checks a single value.
+    # Expects: - A tuple of the kind of the rule ('pattern' or 'vocabulary'), the precompiled pattern or the name of
+    #            the vocabulary, the error message and for vocabularies optionally a pattern of parts of the value that
+    #            are removed before the lookup.
+    #          - A VocabularyRegistry.
+    # Returns: A tuple with the function, which returns True if the value fails the rule, and the error message.
+    kind, target, message, *remove = rule
+    if kind == 'pattern':
+        search = target.search
+
+        def fails(value):
+            count_regex_calls()
+            return search(value) is None
+    elif remove:
+        words = getattr(vocabulary, target)
+        sub = remove[0].sub
+
+        def fails(value):
+            count_regex_calls()
+            return sub('', value) not in words
+    else:
+        words = getattr(vocabulary, target)
+
+        def fails(value):
+            return value not in words
+    return fails, message
+
+
+def compile_picklist(specification, vocabulary):
+    # Compiles a picklist column, whose only rule is a vocabulary and whose cells are split into elements, into a
+    # matcher, which accepts a cell if it consists of elements of the picklist joined by ' * '. The matcher only
+    # knows the elements that can not make the cell fail the format or the split: They contain neither '*' nor
+    # whitespace at their ends and pass the format of the column on their own, which for the formats of the rule
+    # table means that any cell joined from them passes too. Such a cell is split into the same elements by
+    # split_into_list, so it has no errors. The check of a cell is a single split and one lookup per element instead
+    # of the format, the split and the rules, cells the matcher does not accept are checked by all of them.
+    # Expects: - A dictionary from the rule table.
+    #          - A VocabularyRegistry.
+    # Returns: A function, which returns True if the cell has no errors, or None if the column is no picklist column.
+    rules = specification['rules']
+    if 'split' not in specification or len(rules) != 1 or rules[0][0] != 'vocabulary' or len(rules[0]) > 3:
+        return None
+    format_search = specification.get('format', (None, None))[0]
+    elements = frozenset(element for element in getattr(vocabulary, rules[0][1])
+                         if element and '*' not in element and element == element.strip() and
+                         (format_search is None or format_search.search(element) is not None))
+
+    def accepts(cell):
+        for element in cell.split(" * "):
+            if element not in elements:
+                return False
+        return True
+    return accepts
+
+
+def compile_column(specification, vocabulary):
+    # Compiles the specification of a column from the rule table into a function, which checks a cell against all
+    # rules of the column in a single pass. The cell is split at most once and the messages of every distinct cell are
+    # memoized, as they do not depend on the line. Cells of picklist columns are first given to the matcher of
+    # compile_picklist.
+    # Expects: - A dictionary from the rule table.
+    #          - A VocabularyRegistry.
+    # Returns: A function, which returns a tuple with the ids of the error messages of a cell.
+    empty_message = message_id(specification['empty'])
+    format_search, format_message = specification.get('format', (None, None))
+    if format_message is not None:
+        format_message = message_id(format_message)
+    split = specification.get('split')
+    once_per_cell = specification.get('once_per_cell', False)
+    rules = [(fails, message_id(message))
+             for fails, message in (compile_rule(rule, vocabulary) for rule in specification['rules'])]
+    accepts = compile_picklist(specification, vocabulary)
+
+    def check_cell(cell):
+        if cell == "":
+            return (empty_message,)
+        if accepts is not None and accepts(cell):
+            return ()
+        if format_search is not None:
+            count_regex_calls()
+            if format_search.search(cell) is None:
+                return (format_message,)
+        elements = split_into_list(cell) if split is not None and split in cell else (cell,)
+        if once_per_cell:
+            return tuple(message for fails, message in rules if any(fails(element) for element in elements))
+        return tuple(message for element in elements for fails, message in rules if fails(element))
+
+    memo = dict()
+
+    def messages(cell):
+        result = memo.get(cell)
+        if result is None:
+            result = check_cell(cell)
+            if len(memo) < global_rule_memo_size:
+                memo[cell] = result
+        return result
+    return messages
+
+
+class RulePlan:
+    # The rule table compiled into one function per column. Checks all columns of a dataframe in a single pass over
+    # the rows.
+
+    def __init__(self, rule_table, vocabulary):
+        self.cell_checkers = {specification['column']: compile_column(specification, vocabulary)
+                              for specification in rule_table}
+        self.required = {specification['column']: specification['required'] for specification in rule_table}
+        self.inspected = {specification['column']: bool(specification['rules']) or 'format' in specification
+                          for specification in rule_table}
+
+    def check_column(self, column, series):
+        # Checks a single column.
+        # Expects: - The name of the column.
+        #          - A series from a pandas dataframe.
+        # Returns: A ColumnErrors with the errors of the column.
+        messages = self.cell_checkers[column]
+        errors = ColumnErrors()
+        for index, cell in enumerate(series.to_numpy(dtype=object)):
+            for message in messages(cell):
+                errors.append(line_number(index), message)
+        return errors
+
+    def check(self, dataframe, budget=None, progress=None, absent=True, first_line=None):
+        # Checks all columns of a dataframe in a single pass over the rows. Columns missing from the dataframe get a
+        # single error. The pass stops after the row in which the error budget is used up.
+        # Expects: - A pandas dataframe.
+        #          - An ErrorBudget or None.
+        #          - A CheckProgress, which is updated every global_progress_step rows, or None.
+        #          - Whether missing columns get their error, which only the first chunk of the stream mode does.
+        #          - The line number of the first row or None to calculate it from the globals with line_number. The
+        #            validation service passes it, so requests are checked at the same time without sharing globals.
+        # Returns: A dictionary with the Attributes as keys and ColumnErrors as values.
+        errors = {column: absent_errors(column) if absent and column not in dataframe else ColumnErrors()
+                  for column in self.cell_checkers}
+        present = [column for column in self.cell_checkers if column in dataframe]
+        checkers = [(self.cell_checkers[column], errors[column].lines.append, errors[column].messages.append)
+                    for column in present]
+        if budget is not None and budget.exceeded(errors) is not None:
+            budget.stop(0, budget.exceeded(errors))
+            return errors
+        cells = load_columns(dataframe, present, [column for column in present if not self.inspected[column]])
+        if first_line is None:
+            first_line = line_number(0)
+        step = global_progress_step if progress is not None else 0
+        for index, row in enumerate(zip(*cells)):
+            if step and index and not index % step:
+                progress.update(index, {column: len(column_errors) for column, column_errors in errors.items()})
+            line = None
+            for (messages, append_line, append_message), cell in zip(checkers, row):
+                cell_messages = messages(cell)
+                if cell_messages:
+                    if line is None:
+                        line = index + first_line
+                    for message in cell_messages:
+                        append_line(line)
+                        append_message(message)
+            if line is not None and budget is not None:
+                reason = budget.exceeded(errors)
+                if reason is not None:
+                    budget.stop(line, reason)
+                    break
+        return errors
+
+
+def get_rule_plan():
+    # Returns the shared RulePlan and compiles the rule table on first use.
+    # Expects: None.
+    # Returns: A RulePlan.
+    global global_rule_plan
+    if global_rule_plan is None:
+        global_rule_plan = RulePlan(global_rule_table, get_vocabulary())
+    return global_rule_plan
+
+
+def check_rule_column(column, series):
+    # Checks a single column with the compiled rule plan.
+    # Expects: - The name of the column.
+    #          - A series from a pandas dataframe.
+    # Returns: A ColumnErrors with the errors of the column.
+    return get_rule_plan().check_column(column, series)
+
+
+global_rule_checkers = {specification['column']: partial(check_rule_column, specification['column'])
+                        for specification in global_rule_table}
+global_vectorized_checkers = {specification['column']: partial(check_vectorized_column, specification['column'])
+                              for specification in global_rule_table}
+
+
+def absent_column_errors(dataframe, absent=True):
+    # Creates the errors of all columns of the rule table that are missing from a dataframe.
+    # Expects: - A pandas dataframe.
+    #          - Whether the missing columns get their error. In the stream mode only the first chunk reports them.
+    # Returns: A dictionary with the missing Attributes as keys and ColumnErrors with a single error or, if the
+    #          errors are not reported, without errors as values.
+    return {column: absent_errors(column) if absent else ColumnErrors()
+            for column in global_absent_message_ids if column not in dataframe}
+
+
+def error_records(errors):
+    # Turns the errors into records, which can be filtered by line, Attribute, severity or code without parsing the
+    # messages.
+    # Expects: A dictionary with the Attributes as keys and ColumnErrors as values.
+    # Returns: A list of tuples with the fields of global_record_fields, ordered by line. Errors that belong to no
+    #          line, like missing columns, have the line None and come first.
+    records = []
+    for column, column_errors in errors.items():
+        references = column_errors.references
+        for index, (line, message) in enumerate(zip(column_errors.lines, column_errors.messages)):
+            _, severity, code, text = global_messages[message]
+            if index in references:
+                text = text.replace("{reference}", str(references[index]))
+            records.append((line or None, column, severity, code, text))
+    records.sort(key=lambda record: record[0] or 0)
+    return records
+
+
+def check_data(dataframe, budget=None, progress=None, absent=True):
+    # Checks data within a dataframe according to the rules of the DIF with the compiled rule plan. If the
+    # check-functions are measured, every column is checked in a pass of its own.
+    # Expects: - A pandas dataframe.
+    #          - An ErrorBudget, at which the pass over the rows stops, or None.
+    #          - A CheckProgress, which is updated during the pass over the rows, or None.
+    #          - Whether missing columns get their error.
+    # Returns: A dictionary with the Attributes as keys and ColumnErrors as values.
+    if not global_check_hooks:
+        return get_rule_plan().check(dataframe, budget, progress, absent)
+    errors = absent_column_errors(dataframe, absent)
+    for column, checker in global_rule_checkers.items():
+        if column in dataframe:
+            errors[column] = run_checker(column, checker, dataframe[column])
+    return {column: errors[column] for column in global_rule_checkers}
+
+
+def check_column_partition(column, checker, series, row_offset, header_lines, measure=False):
+    # Runs a check-function on a partition of a column. Is called within the worker processes, which is why the
+    # globals for the line numbers are set from the arguments.
+    # Expects: - The name of the column.
+    #          - The check-function of the column.
+    #          - A series containing a range of rows of the column.
+    #          - The number of data rows in the file before the partition.
+    #          - The number of header lines except the column names.
+    #          - Whether the check-function is to be measured.
+    # Returns: A tuple with the list of errors of the check-function and its CheckStatistics or None.
+    global global_row_offset, global_header_lines
+    global_row_offset = row_offset
+    global_header_lines = header_lines
+    if measure:
+        return measure_checker(column, checker, series)
+    return checker(series), None
+
+
+def check_data_vectorized(dataframe, absent=True):
+    # Checks data within a dataframe like check_data, but with the vectorized check-functions.
+    # Expects: - A pandas dataframe.
+    #          - Whether missing columns get their error.
+    # Returns: A dictionary with the Attributes as keys and ColumnErrors as values.
+    errors = absent_column_errors(dataframe, absent)
+    for column, checker in global_vectorized_checkers.items():
+        if column in dataframe:
+            errors[column] = run_checker(column, checker, dataframe[column])
+    return {column: errors[column] for column in global_vectorized_checkers}
+
+
+def check_data_parallel(dataframe, workers, executor, checkers=global_rule_checkers, absent=True):
+    # Checks data within a dataframe like check_data, but splits every column into one partition of rows per worker
+    # and checks all partitions of all columns in the worker processes. The errors of the partitions are joined in the
+    # order of the rows, so the result is the same as the one of check_data.
+    # Expects: - A pandas dataframe.
+    #          - The number of workers.
+    #          - A ProcessPoolExecutor.
+    #          - A dictionary with the Attributes as keys and the check-functions as values.
+    #          - Whether missing columns get their error.
+    # Returns: A dictionary with the Attributes as keys and ColumnErrors as values.
+    partition_size = max(1, -(-len(dataframe) // workers))
+    futures = dict()
+    for column, checker in checkers.items():
+        if column not in dataframe:
             continue
-        if re.search(r"^https://\S+(?:\s\*\shttps://\S+)*$", link) is None:
-            link_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: Link is not in a valid format.")
-    return link_errors
-
-
-def check_title(titles):
-    # Checks the column 'Title' according to the rules of the DIF.
-    # Expects: A series from a pandas dataframe containing the title strings.
-    # Returns: A list of errors with line number and type of error.
-    title_errors = []
-
-    for index, title in enumerate(titles):
-        if title == "":
-            title_errors.append(f"Line {index + global_header_lines + global_line_offset}: Title is missing.")
-    return title_errors
-
+        series = dataframe[column]
+        futures[column] = [
+            executor.submit(check_column_partition, column, checker, series.iloc[start:start + partition_size],
+                            global_row_offset + start, global_header_lines, bool(global_check_hooks))
+            for start in range(0, len(series), partition_size)]
+
+    errors = absent_column_errors(dataframe, absent)
+    for column, partitions in futures.items():
+        errors[column] = ColumnErrors()
+        for partition in partitions:
+            partition_errors, statistics = partition.result()
+            errors[column].extend(partition_errors)
+            if statistics is not None:
+                call_check_hooks(statistics)
+    return {column: errors[column] for column in checkers}
+
+
+def run_checks(dataframe, vectorized=False, workers=1, executor=None, cache=None, deep_check=None,
+               catalogue_index=None, budget=None, progress=None, absent=True):
+    # Checks data within a dataframe with the engine selected by the command line arguments. The rule plan stops at
+    # the row in which the error budget is used up, the errors of the other engines are cut off after that row. Once
+    # the budget is used up, neither the deep check nor the catalogue index run.
+    # Expects: - A pandas dataframe.
+    #          - Whether the vectorized check-functions are to be used.
+    #          - The number of worker processes.
+    #          - A ProcessPoolExecutor if there is more than one worker.
+    #          - An ErrorCache if only new or changed rows are to be checked.
+    #          - A DeepCheck if the links and disciplines are to be resolved.
+    #          - A CatalogueIndex if duplicates across rows are to be found.
+    #          - An ErrorBudget, which is updated, or None.
+    #          - A CheckProgress, which the rule plan updates while checking, or None.
+    #          - Whether missing columns get their error. In the stream mode only the first chunk reports them, so they
+    #            are reported and counted once.
+    # Returns: A dictionary with the Attributes as keys and ColumnErrors as values.
+    if cache is not None:
+        errors = check_data_incremental(dataframe, cache, lambda rows: run_checks(rows, vectorized, workers, executor),
+                                        absent)
+    elif executor is not None:
+        checkers = global_vectorized_checkers if vectorized else global_rule_checkers
+        errors = check_data_parallel(dataframe, workers, executor, checkers, absent)
+    elif vectorized:
+        errors = check_data_vectorized(dataframe, absent)
+    else:
+        errors = check_data(dataframe, budget, progress, absent)
+    if budget is not None:
+        if budget.line is None:
+            budget.truncate(errors)
+        budget.spend(errors)
+        if budget.line is not None:
+            return errors
+    if deep_check is not None:
+        deep_check.check(dataframe, errors)
+    if catalogue_index is not None:
+        catalogue_index.check(dataframe, errors)
+    return errors
 
-def check_description(descriptions):
-    # Checks the column 'Description' according to the rules of the DIF.
-    # Expects: A series from a pandas dataframe containing the description strings.
-    # Returns: A list of errors with the line number and type of error.
-    description_errors = []
 
-    for index, description in enumerate(descriptions):
-        if description == "":
-            description_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: It is recommended to provide a description for a resource.")
-    return description_errors
+class ErrorBudget:
+    # The number of errors after which a check stops, either in total or for single Attributes. The errors are counted
+    # across all chunks of the stream mode, where a missing column counts once, as only the first chunk reports it.
+    # Only the errors of the rules count, not those of the deep check or the catalogue index.
+
+    def __init__(self, max_errors=None, column_budgets=None):
+        self.max_errors = max_errors
+        self.column_budgets = column_budgets or dict()
+        self.counts = Counter()
+        self.line = None
+        self.reason = None
+
+    def reason_for(self, counts):
+        # Tests the numbers of errors against the budgets.
+        # Expects: A dictionary with the Attributes as keys and the numbers of errors so far as values.
+        # Returns: A string saying which budget is used up or None.
+        for column, budget in self.column_budgets.items():
+            if counts.get(column, 0) >= budget:
+                return f"the Attribute '{column}' reached its budget of {budget} errors"
+        if self.max_errors is not None and sum(counts.values()) >= self.max_errors:
+            return f"the check reached the maximum of {self.max_errors} errors"
+        return None
+
+    def exceeded(self, errors):
+        # Tests whether the budget is used up by the errors of the current chunk and all chunks before.
+        # Expects: A dictionary with the Attributes as keys and ColumnErrors as values.
+        # Returns: A string saying which budget is used up or None.
+        return self.reason_for({column: self.counts[column] + len(column_errors)
+                                for column, column_errors in errors.items()})
+
+    def stop(self, line, reason):
+        self.line = line
+        self.reason = reason
+
+    def truncate(self, errors):
+        # Finds the line in which the budget is used up and removes all errors after it, for the engines which check
+        # a column at once instead of row by row.
+        # Expects: A dictionary with the Attributes as keys and ColumnErrors as values, which are changed in place.
+        # Returns: None.
+        counts = Counter(self.counts)
+        counts.update({column: len(column_errors) for column, column_errors in errors.items()})
+        if self.reason_for(counts) is None:
+            return
+        counts = Counter(self.counts)
+        events = sorted((line, column) for column, column_errors in errors.items() for line in column_errors.lines)
+        for line, line_events in groupby(events, key=lambda event: event[0]):
+            counts.update(column for _, column in line_events)
+            reason = self.reason_for(counts)
+            if reason is not None:
+                self.stop(line, reason)
+                break
+        else:
+            return
+        for column_errors in errors.values():
+            position = bisect_right(column_errors.lines, self.line)
+            del column_errors.lines[position:]
+            del column_errors.messages[position:]
+            for index in [index for index in column_errors.references if index >= position]:
+                del column_errors.references[index]
+
+    def spend(self, errors):
+        self.counts.update({column: len(column_errors) for column, column_errors in errors.items()})
+
+
+class ErrorCache:
+    # Caches the errors of every row in a SQLite-file with the hash of the row as key. The errors are stored without
+    # line numbers, as they only depend on the content of the row, and every distinct message is stored only once. The
+    # cache belongs to a version made up of the vocabularies and this script, so it is emptied whenever one of them
+    # changes. The hashes are read into memory with a single scan on the first lookup, which is much faster than
+    # querying every hash when most rows of the file are cached.
+
+    def __init__(self, path):
+        self.columns = list(global_rule_checkers)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS cache_version (version TEXT)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY, message TEXT UNIQUE)")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS row_errors (hash BLOB PRIMARY KEY, errors TEXT) WITHOUT ROWID")
+        version = self.calculate_version()
+        if self.connection.execute("SELECT version FROM cache_version").fetchone() != (version,):
+            self.connection.execute("DELETE FROM row_errors")
+            self.connection.execute("DELETE FROM messages")
+            self.connection.execute("DELETE FROM cache_version")
+            self.connection.execute("INSERT INTO cache_version VALUES (?)", (version,))
+        self.connection.commit()
+        self.messages = dict(self.connection.execute("SELECT id, message FROM messages"))
+        self.message_ids = {message: message_id for message_id, message in self.messages.items()}
+        self.row_errors = None
+
+    @staticmethod
+    def calculate_version():
+        # Calculates the version of the cache from the vocabularies and the source code of this script.
+        # Expects: None.
+        # Returns: The version as a hexadecimal string.
+        digest = hashlib.blake2b(get_vocabulary().version().encode(), digest_size=16)
+        with open(__file__, 'rb') as script:
+            digest.update(script.read())
+        return digest.hexdigest()
+
+    def lookup(self, hashes):
+        # Looks up the cached errors of rows.
+        # Expects: A collection of row hashes.
+        # Returns: A dictionary with the hashes found in the cache as keys and lists of tuples with the Attribute and
+        #          the id of the message in global_messages as values.
+        if self.row_errors is None:
+            self.row_errors = dict(self.connection.execute("SELECT hash, errors FROM row_errors"))
+        found = dict()
+        for row_hash in hashes:
+            errors = self.row_errors.get(row_hash)
+            if errors == "[]":
+                found[row_hash] = []
+            elif errors is not None:
+                found[row_hash] = [(self.columns[column_id], message_id(self.messages[cached_id]))
+                                   for column_id, cached_id in json.loads(errors)]
+        return found
+
+    def cached_message_id(self, message):
+        # Returns the id of a message in the cache and stores the message if it is not in the cache yet.
+        # Expects: An error message.
+        # Returns: The id as an integer.
+        if message not in self.message_ids:
+            message_id = self.connection.execute("INSERT INTO messages (message) VALUES (?)", (message,)).lastrowid
+            self.message_ids[message] = message_id
+            self.messages[message_id] = message
+        return self.message_ids[message]
+
+    def store(self, row_errors):
+        # Stores the errors of rows.
+        # Expects: A dictionary with the row hashes as keys and lists of tuples with the Attribute and the id of the
+        #          message in global_messages as values.
+        # Returns: None.
+        column_ids = {column: column_id for column_id, column in enumerate(self.columns)}
+        rows = [(row_hash, json.dumps([[column_ids[column], self.cached_message_id(global_messages[message][3])]
+                                       for column, message in errors]))
+                for row_hash, errors in row_errors.items()]
+        self.connection.executemany("INSERT OR REPLACE INTO row_errors (hash, errors) VALUES (?, ?)", rows)
+        self.connection.commit()
+        if self.row_errors is not None:
+            self.row_errors.update(rows)
+
+    def close(self):
+        self.connection.close()
+
+
+def row_hashes(dataframe):
+    # Hashes the content of all checked columns of every row together with the names of these columns, so a row of a
+    # csv-file with other columns, which gets other errors, does not share the hash of a row with the same values.
+    # Expects: A pandas dataframe.
+    # Returns: A list of hashes as bytes in the order of the rows.
+    present = [column for column in global_rule_checkers if column in dataframe]
+    names = hashlib.blake2b(("\x1f".join(present) + "\x1e").encode(), digest_size=16)
+    columns = [dataframe[column].to_numpy(dtype=object) for column in present]
+    hashes = []
+    for row in zip(*columns):
+        row_hash = names.copy()
+        row_hash.update("\x1f".join(row).encode())
+        hashes.append(row_hash.digest())
+    return hashes
+
+
+def check_data_incremental(dataframe, cache, check, absent=True):
+    # Checks data within a dataframe, but only checks the rows that are not in the cache yet. Rows with the same content
+    # are checked only once. The errors of the cached and the checked rows are joined in the order of the rows, so the
+    # result is the same as the one of check_data.
+    # Expects: - A pandas dataframe.
+    #          - An ErrorCache.
+    #          - A function that checks a dataframe and returns the errors like check_data.
+    #          - Whether missing columns get their error.
+    # Returns: A dictionary with the Attributes as keys and ColumnErrors as values.
+    hashes = row_hashes(dataframe)
+    row_errors = cache.lookup(set(hashes))
+
+    new_rows = dict()
+    for position, row_hash in enumerate(hashes):
+        if row_hash not in row_errors and row_hash not in new_rows:
+            new_rows[row_hash] = position
+    if new_rows:
+        new_hashes = list(new_rows)
+        new_errors = {row_hash: [] for row_hash in new_hashes}
+        first_line = line_number(0)
+        for column, errors in check(dataframe.iloc[list(new_rows.values())]).items():
+            if column not in dataframe:
+                continue
+            for line, message in zip(errors.lines, errors.messages):
+                new_errors[new_hashes[line - first_line]].append((column, message))
+        cache.store(new_errors)
+        row_errors.update(new_errors)
+
+    errors = {column: ColumnErrors() for column in global_rule_checkers}
+    errors.update(absent_column_errors(dataframe, absent))
+    for position, row_hash in enumerate(hashes):
+        for column, message in row_errors[row_hash]:
+            errors[column].append(line_number(position), message)
+    return errors
 
 
-def check_community_format(string):
-    # Checks the community string formatting.
+def merge_errors(errors, additional):
+    # Merges further errors of a column into its errors in the order of the lines. Within a line the further errors come
+    # after the existing ones.
+    # Expects: - A ColumnErrors.
+    #          - A list of tuples with the line number, the id of the message and optionally the line number the
+    #            message refers to, ordered by line.
+    # Returns: A ColumnErrors with all errors.
+    merged = ColumnErrors()
+    position = 0
+    for line, message, *reference in additional:
+        while position < len(errors) and errors.lines[position] <= line:
+            merged.append(errors.lines[position], errors.messages[position], errors.references.get(position, 0))
+            position += 1
+        merged.append(line, message, *reference)
+    offset = len(merged) - position
+    merged.references.update((index + offset, reference) for index, reference in errors.references.items()
+                             if index >= position)
+    merged.lines.extend(errors.lines[position:])
+    merged.messages.extend(errors.messages[position:])
+    return merged
+
+
+def read_discipline_scheme(path):
+    # Reads a local snapshot of the Hochschulfächersystematik, either the JSON of the scheme as published on skohub.io
+    # or a text file with one URI per line.
+    # Expects: The path to the snapshot.
+    # Returns: A frozenset with the URIs of all disciplines.
+    with open(path, 'r', encoding='utf-8') as file:
+        if not path.endswith('.json'):
+            return frozenset(line.strip().rstrip('/') for line in file if line.strip())
+        scheme = json.load(file)
+    uris = set()
+    pending = [scheme]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in ('id', '@id') and isinstance(value, str):
+                    uris.add(value.rstrip('/'))
+                else:
+                    pending.append(value)
+        elif isinstance(node, list):
+            pending.extend(node)
+    if isinstance(scheme, dict):
+        uris.discard(str(scheme.get('id', scheme.get('@id', ""))).rstrip('/'))
+    return frozenset(uris)
+
+
+def fetch_status(url, timeout):
+    # Requests a URL with HEAD, or with GET if the server does not allow HEAD, and follows redirects.
+    # Expects: - The URL.
+    #          - The timeout in seconds.
+    # Returns: The HTTP status code or 0 if the server could not be reached.
+    import urllib.error
+    import urllib.request
+    for method in ('HEAD', 'GET'):
+        try:
+            request = urllib.request.Request(url, method=method, headers={'User-Agent': "dalia-dif-compliance-check"})
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return response.status
+        except urllib.error.HTTPError as error:
+            if error.code not in (405, 501):
+                return error.code
+            status = error.code
+        except (urllib.error.URLError, OSError, ValueError):
+            return 0
+    return status
+
+
+async def fetch_statuses(urls, concurrency, timeout):
+    # Requests many URLs at the same time, but never more than the given number at once.
+    # Expects: - A list of URLs.
+    #          - The maximal number of requests at the same time.
+    #          - The timeout of a request in seconds.
+    # Returns: A dictionary with the URLs as keys and the HTTP status codes as values.
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        async def fetch(url):
+            async with semaphore:
+                return url, await loop.run_in_executor(pool, fetch_status, url, timeout)
+        return dict(await asyncio.gather(*(fetch(url) for url in urls)))
+
+
+class LinkResolver:
+    # Resolves links in bulk and keeps their HTTP status codes in memory and in a SQLite-file, so every distinct link
+    # is requested at most once per run and not again until its entry is older than the time to live. Links that gave
+    # no status code, e.g. after a timeout or a failed DNS lookup, are only kept in memory and requested again in the
+    # next run, as the failure may be temporary. The requests can be sent to a stand-in server instead of the hosts of
+    # the links by giving its origin, e.g. 'http://127.0.0.1:8000', which then receives the path and query of every
+    # link.
+
+    def __init__(self, path=None, ttl=24 * 3600, concurrency=16, timeout=10, origin=None):
+        self.ttl = ttl
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.origin = origin.rstrip('/') if origin else None
+        self.statuses = dict()
+        self.requests = 0
+        self.connection = sqlite3.connect(path if path is not None else ":memory:")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS url_status (url TEXT PRIMARY KEY, status INTEGER, checked REAL) WITHOUT ROWID")
+        self.connection.execute("DELETE FROM url_status WHERE checked < ?", (time.time() - ttl,))
+        self.connection.commit()
+
+    def request_url(self, url):
+        # Returns the URL the request for a link is sent to.
+        # Expects: A link.
+        # Returns: The link itself or the link moved to the origin of the stand-in server.
+        if self.origin is None:
+            return url
+        parts = urlparse(url)
+        return self.origin + (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+    def resolve(self, urls):
+        # Looks up the status codes of links in memory, then in the SQLite-file, and requests all remaining links.
+        # Expects: A collection of links.
+        # Returns: None.
+        pending = [url for url in dict.fromkeys(urls) if url not in self.statuses]
+        if not pending:
+            return
+        expiry = time.time() - self.ttl
+        for start in range(0, len(pending), 500):
+            batch = pending[start:start + 500]
+            self.statuses.update(self.connection.execute(
+                f"SELECT url, status FROM url_status WHERE checked >= ? AND url IN ({','.join('?' * len(batch))})",
+                [expiry] + batch))
+        pending = [url for url in pending if url not in self.statuses]
+        if not pending:
+            return
+        import asyncio
+        requested = asyncio.run(fetch_statuses([self.request_url(url) for url in pending], self.concurrency,
+                                               self.timeout))
+        self.requests += len(pending)
+        checked = time.time()
+        statuses = {url: requested[self.request_url(url)] for url in pending}
+        self.statuses.update(statuses)
+        self.connection.executemany("INSERT OR REPLACE INTO url_status (url, status, checked) VALUES (?, ?, ?)",
+                                    [(url, status, checked) for url, status in statuses.items() if status])
+        self.connection.commit()
+
+    def resolvable(self, url):
+        # Expects: A link that has been resolved.
+        # Returns: True if the link answered with a status code below 400.
+        return 0 < self.statuses[url] < 400
+
+    def close(self):
+        self.connection.close()
+
+
+class DeepCheck:
+    # Checks what the patterns of the rule table can not: whether the links can be resolved and whether the
+    # disciplines are part of a local snapshot of the Hochschulfächersystematik. Only values that passed the rules of
+    # their column are checked and every distinct link is resolved only once.
+
+    def __init__(self, disciplines=None, resolver=None):
+        self.disciplines = disciplines
+        self.resolver = resolver
+
+    def elements(self, dataframe, column, pattern):
+        # Splits all cells of a column that match the pattern of the column into their values.
+        # Expects: - A pandas dataframe.
+        #          - The name of the column.
+        #          - The precompiled pattern of the column.
+        # Returns: A list of tuples with the position of the row and the list of values.
+        cells = []
+        for position, cell in enumerate(column_values(dataframe, column)):
+            if cell != "" and pattern.search(cell) is not None:
+                cells.append((position, global_split_pattern.split(cell)))
+        return cells
+
+    def check(self, dataframe, errors):
+        # Adds the errors of the deep check to the errors of the other checks.
+        # Expects: - A pandas dataframe.
+        #          - A dictionary with the Attributes as keys and ColumnErrors as values, which is updated.
+        # Returns: None.
+        if self.resolver is not None and 'Link' in dataframe:
+            cells = self.elements(dataframe, 'Link', global_link_pattern)
+            self.resolver.resolve(link for _, links in cells for link in links)
+            message = message_id("The link could not be resolved.")
+            failures = [(line_number(position), message) for position, links in cells
+                        for link in links if not self.resolver.resolvable(link)]
+            errors['Link'] = merge_errors(errors['Link'], failures)
+        if self.disciplines is not None and 'Discipline' in dataframe:
+            message = message_id("The provided discipline is not part of the Hochschulfächersystematik.")
+            failures = [(line_number(position), message)
+                        for position, disciplines in self.elements(dataframe, 'Discipline', global_discipline_pattern)
+                        for discipline in disciplines if global_discipline_pattern.search(discipline) is not None and
+                        discipline.strip().rstrip('/') not in self.disciplines]
+            errors['Discipline'] = merge_errors(errors['Discipline'], failures)
+
+    def close(self):
+        if self.resolver is not None:
+            self.resolver.close()
+
+
+def normalize_text(text):
+    # Normalizes a text for comparisons across rows by ignoring case and differences in whitespace.
     # Expects: A string.
-    # Returns: If string is of format 'Community (S|R|RS)' False or no error and if not True or error found.
-    if re.search(r'^[\S\s]*\s\((RS|SR|S|R)\)$', string) is not None:
-        return False
+    # Returns: The normalized string.
+    return " ".join(text.casefold().split())
+
+
+def parse_author(author):
+    # Splits a name of the column 'Authors' of the format 'Last, First : {id}' into the name and the identifier. ORCIDs
+    # are compared without the prefix 'https://orcid.org/'. Only string methods are used, so it takes linear time.
+    # Expects: A single name.
+    # Returns: A tuple with the normalized name and identifier or None if the name has no identifier or belongs to an
+    #          organization.
+    author = author.strip()
+    start = author.rfind('{')
+    if start < 0 or not author.endswith('}'):
+        return None
+    identifier = author[start + 1:-1].strip().casefold()
+    name = normalize_text(author[:start].rstrip().removesuffix(':'))
+    for prefix in ("https://orcid.org/", "http://orcid.org/"):
+        identifier = identifier.removeprefix(prefix)
+    if not name or identifier in ("", "organization"):
+        return None
+    return name, identifier
+
+
+class MinHashIndex:
+    # Finds near duplicates of texts with MinHash signatures over the character trigrams of the texts and locality
+    # sensitive hashing. The signature is split into bands and texts sharing a band with an earlier text are compared
+    # with it by the share of equal values of their signatures, which estimates the Jaccard similarity of their
+    # trigrams. So a text is only compared with a few candidates instead of all earlier texts. The signatures are kept
+    # in a single array with a row per text, which doubles in size when full, and every band in a dictionary from the
+    # band as an integer to the row of the first text with it.
+    prime = (1 << 31) - 1
+
+    def __init__(self, threshold, bands=8, rows=4):
+        import numpy as np
+        generator = np.random.default_rng(0)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.a = generator.integers(1, self.prime, size=(bands * rows, 1), dtype=np.uint64)
+        self.b = generator.integers(0, self.prime, size=(bands * rows, 1), dtype=np.uint64)
+        self.buckets = [dict() for _ in range(bands)]
+        self.signatures = np.empty((1024, bands * rows), dtype=np.uint32)
+        self.lines = array('i')
+
+    def signature(self, text):
+        # Expects: A normalized text.
+        # Returns: A numpy array with the MinHash signature of the text.
+        import numpy as np
+        trigrams = {text[index:index + 3] for index in range(max(1, len(text) - 2))}
+        hashes = np.fromiter((zlib.crc32(trigram.encode()) for trigram in trigrams), dtype=np.uint64,
+                             count=len(trigrams))
+        return ((self.a * hashes + self.b) % self.prime).min(axis=1).astype(np.uint32)
+
+    def add(self, text, line):
+        # Adds a text to the index and looks for an earlier similar text.
+        # Expects: - A normalized text.
+        #          - The line number of the text.
+        # Returns: The line number of the first similar earlier text or 0.
+        import numpy as np
+        signature = self.signature(text)
+        position = len(self.lines)
+        if position == len(self.signatures):
+            self.signatures = np.concatenate((self.signatures, np.empty_like(self.signatures)))
+        similar = 0
+        for band, bucket in enumerate(self.buckets):
+            key = int.from_bytes(signature[band * self.rows:(band + 1) * self.rows].tobytes(), 'little')
+            candidate = bucket.setdefault(key, position)
+            if not similar and candidate != position and \
+                    np.count_nonzero(self.signatures[candidate] == signature) >= self.threshold * len(signature):
+                similar = self.lines[candidate]
+        self.signatures[position] = signature
+        self.lines.append(line)
+        return similar
+
+
+class CatalogueIndex:
+    # Finds duplicates and inconsistencies across the rows of a csv-file: links and titles used by more than one item
+    # and authors with different identifiers. Hash indexes keep the first line of every link, title and author, so
+    # every row is only looked up in the indexes and the analysis takes linear time in a single pass over the rows. In
+    # the stream mode the indexes are kept across chunks. Near duplicates of titles and descriptions are only searched
+    # if a similarity threshold is given.
+
+    def __init__(self, similarity=None):
+        self.links = dict()
+        self.titles = dict()
+        self.authors = dict()
+        self.similar = dict()
+        if similarity is not None:
+            self.similar = {'Title': MinHashIndex(similarity), 'Description': MinHashIndex(similarity)}
+        # Attributes whose only finding is a near duplicate are not even decoded without a similarity threshold.
+        self.messages = {specification['column']: {kind: message_id(message)
+                                                   for kind, message in specification['catalogue']}
+                         for specification in global_rule_table if 'catalogue' in specification and
+                         (specification['column'] in self.similar or
+                          any(kind != 'similar' for kind, _ in specification['catalogue']))}
+
+    def check(self, dataframe, errors):
+        # Adds the findings across rows to the errors of the other checks.
+        # Expects: - A pandas dataframe.
+        #          - A dictionary with the Attributes as keys and ColumnErrors as values, which is updated.
+        # Returns: None.
+        columns = [column for column in self.messages if column in dataframe]
+        findings = {column: [] for column in columns}
+        cells = load_columns(dataframe, columns)
+        for position, row in enumerate(zip(*cells)):
+            line = line_number(position)
+            for column, cell in zip(columns, row):
+                if cell == "":
+                    continue
+                messages = self.messages[column]
+                if column == 'Link':
+                    for link in global_split_pattern.split(cell):
+                        first = self.links.setdefault(link.strip().rstrip('/'), line)
+                        if first != line:
+                            findings[column].append((line, messages['duplicate'], first))
+                elif column == 'Authors':
+                    for author in global_split_pattern.split(cell):
+                        parsed = parse_author(author)
+                        if parsed is None:
+                            continue
+                        identifier, first = self.authors.setdefault(parsed[0], (parsed[1], line))
+                        if identifier != parsed[1]:
+                            findings[column].append((line, messages['identifier'], first))
+                else:
+                    text = normalize_text(cell)
+                    if column == 'Title':
+                        first = self.titles.setdefault(text, line)
+                        if first != line:
+                            findings[column].append((line, messages['duplicate'], first))
+                            continue
+                    if column in self.similar:
+                        similar = self.similar[column].add(text, line)
+                        if similar:
+                            findings[column].append((line, messages['similar'], similar))
+        for column, column_findings in findings.items():
+            if column_findings:
+                errors[column] = merge_errors(errors[column], column_findings)
+
+    def snapshot(self):
+        # Returns the indexes for a checkpoint, without the ids of the messages, which are registered anew when the
+        # check is resumed.
+        return {'links': self.links, 'titles': self.titles, 'authors': self.authors, 'similar': self.similar}
+
+    def restore(self, snapshot):
+        self.__dict__.update(snapshot)
+
+
+class StreamCheckpoint:
+    # A checkpoint of the stream mode, so an interrupted check continues after the last checked chunk instead of
+    # starting over. It holds the number of checked chunks and rows, the numbers of errors so far, the sizes of the
+    # reports, the error budget and the catalogue index, and is written to a pickle file at most once per interval. A
+    # checkpoint only belongs to the same csv-file, unchanged, checked with the same options.
+
+    def __init__(self, path, input_path, options, interval=60.0):
+        self.path = path
+        status = os.stat(input_path)
+        self.identity = (os.path.abspath(input_path), status.st_size, status.st_mtime_ns, options)
+        self.interval = interval
+        self.saved = time.perf_counter()
+
+    def load(self):
+        # Reads the checkpoint of an interrupted check.
+        # Expects: None.
+        # Returns: The state of the check as a dictionary or None if there is no matching checkpoint.
+        try:
+            with open(self.path, 'rb') as file:
+                identity, state = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError) as error:
+            print(f"Ignoring the unreadable checkpoint '{self.path}': {error}")
+            return None
+        if identity != self.identity:
+            print(f"Ignoring the checkpoint '{self.path}', as the csv-file or the options changed.")
+            return None
+        return state
+
+    def save(self, state, force=False):
+        # Writes the state of the check to a temporary file, which then replaces the checkpoint, so an interruption
+        # while writing leaves the last checkpoint intact.
+        # Expects: - The state of the check as a dictionary.
+        #          - Whether to write the checkpoint even if the interval has not passed yet.
+        # Returns: None.
+        now = time.perf_counter()
+        if not force and now - self.saved < self.interval:
+            return
+        temporary = self.path + ".tmp"
+        with open(temporary, 'wb') as file:
+            pickle.dump((self.identity, state), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.path)
+        self.saved = now
+
+    def remove(self):
+        # Removes the checkpoint after the check finished.
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def count_data_rows(path, header_lines=0):
+    # Counts the data rows of a csv-file for the estimated remaining time of the stream mode, with a single scan of the
+    # file mapped into memory.
+    # Expects: - The path to the csv-file.
+    #          - The number of header lines except the column names.
+    # Returns: The number of data rows as an integer or None if the file cannot be scanned.
+    try:
+        mapped = MappedCsv(path)
+    except (OSError, ValueError):
+        return None
+    try:
+        return max(len(mapped) - header_lines, 0)
+    finally:
+        mapped.close()
+
+
+def check_csv_stream(path, header_lines, chunk_size, writers, workers=1, vectorized=False, cache=None,
+                     deep_check=None, catalogue_index=None, budget=None, progress=None, checkpoint=None, state=None):
+    # Checks a csv-file chunk by chunk and writes the errors of every chunk to the reports, so only one chunk and its
+    # errors are held in memory at any time.
+    # Expects: - The path to the csv-file.
+    #          - The number of header lines except the column names.
+    #          - The number of rows per chunk.
+    #          - A list of report writers.
+    #          - The number of worker processes.
+    #          - Whether the vectorized check-functions are to be used.
+    #          - An ErrorCache if only new or changed rows are to be checked.
+    #          - A DeepCheck if the links and disciplines are to be resolved.
+    #          - A CatalogueIndex if duplicates across rows are to be found. It is kept across all chunks.
+    #          - An ErrorBudget, after which no further chunk is read, or None.
+    #          - A CheckProgress, which is updated after every chunk, or None.
+    #          - A StreamCheckpoint, which is saved after every chunk once its interval has passed, or None.
+    #          - The state of an interrupted check from its checkpoint or None. The chunks checked before are skipped.
+    # Returns: A tuple with the number of checked rows and a dictionary with the Attributes as keys and the number of
+    #          errors as values.
+    from concurrent.futures import ProcessPoolExecutor
+    global global_row_offset
+    global_row_offset = 0 if state is None else state['rows']
+    error_counts = dict() if state is None else dict(state['errors'])
+    skipped = 0 if state is None else state['chunks']
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for number, chunk in enumerate(read_csv_chunks(path, chunk_size)):
+            remove_chunk_header_lines(header_lines, chunk)
+            if number < skipped:
+                continue
+            fill_empty_cells(chunk)
+            errors = run_checks(chunk, vectorized, workers, executor, cache, deep_check, catalogue_index, budget,
+                                absent=number == 0)
+            write_reports(writers, errors)
+            for column, column_errors in errors.items():
+                error_counts[column] = error_counts.get(column, 0) + len(column_errors)
+            global_row_offset += len(chunk)
+            if progress is not None:
+                progress.update(global_row_offset, dict(error_counts))
+            if budget is not None and budget.line is not None:
+                break
+            if checkpoint is not None:
+                checkpoint.save({
+                    'chunks': number + 1, 'rows': global_row_offset, 'errors': error_counts,
+                    'positions': [writer.position() for writer in writers],
+                    'budget': None if budget is None else budget.counts,
+                    'catalogue': None if catalogue_index is None else catalogue_index.snapshot()})
+        return global_row_offset, error_counts
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        global_row_offset = 0
+
+
+def check_file(path, report_name, header_lines=0, stream=False, chunk_size=global_chunk_size, vectorized=False,
+               workers=1, cache=None, formats=('wide',), deep_check=None, duplicates=False, similarity=None,
+               mapped=False, max_errors=None, column_budgets=None, fail_fast=False, checkpoint=None):
+    # Checks a csv-file with the engine selected by the command line arguments and writes its reports. The progress is
+    # passed to the progress hooks, if any are registered.
+    # Expects: - The path to the csv-file.
+    #          - The name of the report without file extension.
+    #          - The number of header lines except the column names.
+    #          - Whether the csv-file is to be checked in chunks.
+    #          - The number of rows per chunk in the stream mode.
+    #          - Whether the vectorized check-functions are to be used.
+    #          - The number of worker processes.
+    #          - An ErrorCache if only new or changed rows are to be checked.
+    #          - A list of the formats of the reports from global_report_formats.
+    #          - A DeepCheck if the links and disciplines are to be resolved.
+    #          - Whether duplicates across rows are to be found.
+    #          - The threshold of the similarity of near duplicate titles and descriptions or None if they are not to
+    #            be found.
+    #          - Whether the csv-file is to be read through a memory map.
+    #          - The number of errors after which the check stops or None.
+    #          - A dictionary with Attributes as keys and the number of errors after which the check stops as values.
+    #          - Whether the rows are not to be checked if a mandatory Attribute is missing.
+    #          - A StreamCheckpoint to resume an interrupted check from and to save the progress of the stream mode to
+    #            or None.
+    # Returns: A tuple with the number of checked rows and a dictionary with the Attributes as keys and the number of
+    #          errors as values or None if the file could not be read.
+    if fail_fast:
+        header = read_header(path)
+        if header is None:
+            return None
+        missing = missing_required_columns(header)
+        if missing:
+            errors = {column: absent_errors(column) if column in missing else ColumnErrors()
+                      for column in global_rule_checkers}
+            writers = open_report_writers(report_name, formats)
+            try:
+                write_reports(writers, errors)
+            finally:
+                close_report_writers(writers)
+            print(f"Mandatory Attributes are missing: {', '.join(missing)}. The rows were not checked.")
+            return 0, {column: len(column_errors) for column, column_errors in errors.items()}
+    catalogue_index = CatalogueIndex(similarity) if duplicates or similarity is not None else None
+    budget = ErrorBudget(max_errors, column_budgets) if max_errors is not None or column_budgets else None
+    progress = CheckProgress() if global_progress_hooks else None
+    if stream:
+        state = checkpoint.load() if checkpoint is not None else None
+        if state is not None:
+            print(f"Resuming the check after row {state['rows']} from the checkpoint '{checkpoint.path}'.")
+            if budget is not None:
+                budget.counts = Counter(state['budget'])
+            if catalogue_index is not None:
+                catalogue_index.restore(state['catalogue'])
+            if progress is not None:
+                progress.resumed_rows = progress.rows = state['rows']
+        if progress is not None:
+            progress.total_rows = count_data_rows(path, header_lines)
+        writers = open_report_writers(report_name, formats, None if state is None else state['positions'])
+        try:
+            result = check_csv_stream(path, header_lines, chunk_size, writers, workers, vectorized, cache,
+                                      deep_check, catalogue_index, budget, progress, checkpoint, state)
+        finally:
+            close_report_writers(writers)
+        if checkpoint is not None:
+            checkpoint.remove()
+        if progress is not None:
+            progress.update(*result, finished=True)
+        report_budget(budget)
+        return result
+
+    csv_file = None
+    if mapped and plain_rule_plan(vectorized, workers, cache):
+        try:
+            csv_file = MappedCsv(path)
+        except FileNotFoundError:
+            print("The file could not be found, please check the provided path!")
+            return None
+        except ValueError:
+            csv_file = None
+    elif fast_path(path, vectorized, workers, cache):
+        try:
+            csv_file = read_csv_rows(path)
+        except ValueError:
+            csv_file = None
+    if csv_file is not None and header_lines > 0:
+        remove_row_header_lines(header_lines, csv_file)
+    if csv_file is None:
+        csv_file = read_csv(path)
+        if csv_file is None:
+            return None
+        if header_lines > 0:
+            remove_header_lines(header_lines, csv_file)
+        fill_empty_cells(csv_file)
+    if progress is not None:
+        progress.total_rows = row_count(csv_file)
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            errors = run_checks(csv_file, vectorized, workers, pool, cache, deep_check, catalogue_index, budget)
     else:
-        return True
-
-
-def check_community_name(string):
-    # Checks if the community name is in the list of community ids.
-    # Expects: A string in the format 'Community ()'
-    # Returns: True if in list, false if not.
-    communities_list = read_communities_list()
-    community_name = re.sub(r'\s\(\S*\)', '', string)
-    if community_name in communities_list["subsidiaries"]:
-        return True
+        try:
+            errors = run_checks(csv_file, vectorized, cache=cache, deep_check=deep_check,
+                                catalogue_index=catalogue_index, budget=budget, progress=progress)
+        finally:
+            if isinstance(csv_file, MappedCsv):
+                csv_file.close()
+    writers = open_report_writers(report_name, formats)
+    try:
+        write_reports(writers, errors)
+    finally:
+        close_report_writers(writers)
+    report_budget(budget)
+    result = row_count(csv_file), {column: len(column_errors) for column, column_errors in errors.items()}
+    if progress is not None:
+        progress.update(*result, finished=True)
+    return result
+
+
+def sample_positions(rows, size, strata, generator):
+    # Draws a stratified random sample of rows. The rows are split into strata of consecutive rows of about the same
+    # size and every stratum contributes rows in proportion to its size, so errors clustered in a part of the file,
+    # e.g. rows appended from another source, are represented in the sample.
+    # Expects: - The number of rows.
+    #          - The number of rows of the sample.
+    #          - The number of strata.
+    #          - A random.Random.
+    # Returns: A sorted list of the positions of the sampled rows.
+    if size >= rows:
+        return list(range(rows))
+    strata = max(1, min(strata, size))
+    bounds = [rows * stratum // strata for stratum in range(strata + 1)]
+    shares = [size * (end - start) / rows for start, end in zip(bounds, bounds[1:])]
+    counts = [int(share) for share in shares]
+    for stratum in sorted(range(strata), key=lambda stratum: counts[stratum] - shares[stratum])[:size - sum(counts)]:
+        counts[stratum] += 1
+    positions = []
+    for start, end, count in zip(bounds, bounds[1:], counts):
+        positions.extend(sorted(generator.sample(range(start, end), count)))
+    return positions
+
+
+def estimate_error_rates(errors, sample_size, rows, confidence=0.95):
+    # Estimates the share of rows with errors of every Attribute from the errors of a sample. As every stratum is
+    # sampled in proportion to its size, the share within the sample is the estimate. The confidence interval is the
+    # Wilson score interval, which also holds for shares close to 0 or 1, narrowed by the finite population
+    # correction, so it has no width when every row was checked.
+    # Expects: - A dictionary with the Attributes as keys and ColumnErrors of the sampled rows as values.
+    #          - The number of sampled rows.
+    #          - The number of rows of the csv-file.
+    #          - The confidence level of the interval.
+    # Returns: A list of dictionaries with the Attribute, the number of sampled rows with errors, the estimated share
+    #          and the bounds of the interval. The share of missing Attributes is None.
+    from statistics import NormalDist
+    if not sample_size:
+        return []
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    if rows > 1:
+        z *= math.sqrt((rows - sample_size) / (rows - 1))
+    estimates = []
+    for column, column_errors in errors.items():
+        lines = {line for line in column_errors.lines if line}
+        if not lines and len(column_errors):
+            estimates.append({'column': column, 'rows': 0, 'rate': None, 'low': None, 'high': None})
+            continue
+        rate = len(lines) / sample_size
+        denominator = 1 + z * z / sample_size
+        center = (rate + z * z / (2 * sample_size)) / denominator
+        margin = z * math.sqrt(rate * (1 - rate) / sample_size + z * z / (4 * sample_size * sample_size)) / denominator
+        estimates.append({'column': column, 'rows': len(lines), 'rate': rate,
+                          'low': max(0.0, center - margin), 'high': min(1.0, center + margin)})
+    return estimates
+
+
+def check_sample(path, report_name, size, header_lines=0, strata=10, seed=None, confidence=0.95, formats=('wide',),
+                 deep_check=None):
+    # Checks a stratified random sample of the rows of a csv-file and estimates the share of rows with errors. The
+    # file is mapped into memory, so finding the rows takes a single scan and only the sampled rows are decoded. The
+    # report contains the errors of the sampled rows with their line numbers in the file.
+    # Expects: - The path to the csv-file.
+    #          - The name of the report without file extension.
+    #          - The number of rows of the sample.
+    #          - The number of header lines except the column names.
+    #          - The number of strata.
+    #          - The seed of the random numbers or None.
+    #          - The confidence level of the intervals.
+    #          - A list of the formats of the reports from global_report_formats.
+    #          - A DeepCheck if the links and disciplines are to be resolved.
+    # Returns: A tuple with the number of rows of the csv-file, the number of sampled rows and the estimates of
+    #          estimate_error_rates or None if the file could not be read.
+    import random
+    try:
+        csv_file = MappedCsv(path)
+    except FileNotFoundError:
+        print("The file could not be found, please check the provided path!")
+        return None
+    except ValueError:
+        csv_file = None
+    if csv_file is not None and header_lines > 0:
+        remove_row_header_lines(header_lines, csv_file)
+    if csv_file is None:
+        csv_file = read_csv(path)
+        if csv_file is None:
+            return None
+        if header_lines > 0:
+            remove_header_lines(header_lines, csv_file)
+        fill_empty_cells(csv_file)
+    rows = row_count(csv_file)
+    positions = sample_positions(rows, size, strata, random.Random(seed))
+    if isinstance(csv_file, MappedCsv):
+        csv_file.keep_rows(positions)
+        try:
+            errors = run_checks(csv_file, deep_check=deep_check)
+        finally:
+            csv_file.close()
     else:
-        return False
-
-
-def check_community(communities):
-    # Checks the column 'Community' according to the rules of the DIF.
-    # Expects: A series from a pandas dataframe containing the supporting or recommending communities.
-    # Returns: A list of errors with the line number and type of error.
-    community_errors = []
-
-    for index, community in enumerate(communities):
-        if community == "":
-            community_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: It is recommended to provide a Community, either as supporting or recommending entity.")
-        else:
-            if r"\*" in community:
-                community_list = split_into_list(community)
-                for com in community_list:
-                    community_errors = check_single_community(com, community_errors, index)
-            else:
-                community_errors = check_single_community(community, community_errors, index)
-    return community_errors
-
-
-def check_single_community(com, community_errors, index):
-    if check_community_format(com):
-        community_errors.append(
-            f"Line {index + global_header_lines + global_line_offset}: The provided format for the community contains errors.")
-    if not check_community_name(com):
-        community_errors.append(
-            f"Line {index + global_header_lines + global_line_offset}: The provided name does not match any name from the subsidiaries list. Please check if the name is correct. If it is you can ignore this warning.")
-    return community_errors
-
-
-def check_disciplines(disciplines):
-    # Checks the column 'Discipline' according to the rules of the DIF.
-    # Expects: A series from a pandas dataframe containing links to the relevant disciplines listed in https://skohub.io/dini-ag-kim/hochschulfaechersystematik/heads/master/w3id.org/kim/hochschulfaechersystematik/scheme.html
-    # Returns: A list of errors with the line number and type of error.
-    disciplines_errors = []
-
-    for index, discipline in enumerate(disciplines):
-        if discipline == "":
-            disciplines_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: It is recommended to provide at least one relevant discipline as a link listed in https://skohub.io/dini-ag-kim/hochschulfaechersystematik/heads/master/w3id.org/kim/hochschulfaechersystematik/scheme.html .")
-        else:
-            if r"\*" in discipline:
-                discipline_list = split_into_list(discipline)
-                for disc in discipline_list:
-                    disciplines_errors = check_single_discipline(disc, disciplines_errors, index)
-            else:
-                disciplines_errors = check_single_discipline(discipline, disciplines_errors, index)
-    return disciplines_errors
-
+        errors = run_checks(csv_file.iloc[positions], deep_check=deep_check)
+    first_line = line_number(0)
+    for column_errors in errors.values():
+        column_errors.lines = array('i', [line_number(positions[line - first_line]) if line else 0
+                                          for line in column_errors.lines])
+    writers = open_report_writers(report_name, formats)
+    try:
+        write_reports(writers, errors)
+    finally:
+        close_report_writers(writers)
+    return rows, len(positions), estimate_error_rates(errors, len(positions), rows, confidence)
+
+
+def print_estimates(rows, sample_size, estimates, confidence):
+    # Prints the estimated shares of rows with errors as a table.
+    # Expects: - The number of rows of the csv-file.
+    #          - The number of sampled rows.
+    #          - The estimates of estimate_error_rates.
+    #          - The confidence level of the intervals.
+    # Returns: None.
+    print(f"Checked a sample of {sample_size} of {rows} rows.")
+    print(f"{'Attribute':<20}{'rows with errors':>18}{'estimated share':>18}{f'{confidence:.0%} interval':>22}")
+    for estimate in estimates:
+        if estimate['rate'] is None:
+            print(f"{estimate['column']:<20}{'':>18}{'missing':>18}")
+            continue
+        interval = f"{estimate['low']:.1%} - {estimate['high']:.1%}"
+        print(f"{estimate['column']:<20}{estimate['rows']:>18}{estimate['rate']:>18.1%}{interval:>22}")
+
+
+def report_budget(budget):
+    # Prints where the check stopped if its error budget was used up.
+    # Expects: An ErrorBudget or None.
+    # Returns: None.
+    if budget is None or budget.line is None:
+        return
+    if budget.line == 0:
+        print(f"Stopped before the first row, as {budget.reason}. The rows were not checked.")
+    else:
+        print(f"Stopped in line {budget.line}, as {budget.reason}. The rest of the file was not checked.")
 
-def check_single_discipline(discipline, discipline_errors, index):
-    if check_discipline_link(discipline):
-        discipline_errors.append(
-            f"Line {index + global_header_lines + global_line_offset}: The provided format is not of the type xsd:anyURI.")
 
-    return discipline_errors
+def read_header(path):
+    # Reads only the names of the columns of a csv-file.
+    # Expects: The path to the csv-file.
+    # Returns: A list of the column names or None if the file could not be found.
+    try:
+        with open(path, 'r', newline="", encoding='utf-8-sig') as file:
+            return unique_column_names(next(csv.reader(file), []))
+    except FileNotFoundError:
+        print("The file could not be found, please check the provided path!")
 
 
-def check_discipline_link(discipline):
-    if re.search(r"^https://w3id\.org/kim/hochschulfaechersystematik/n\d+", discipline) is not None:
+def missing_required_columns(columns):
+    # Finds the mandatory Attributes of the rule table that are missing from a csv-file.
+    # Expects: A list of column names.
+    # Returns: A list of the missing Attributes.
+    return [specification['column'] for specification in global_rule_table
+            if specification['required'] and specification['column'] not in columns]
+
+
+def plain_rule_plan(vectorized=False, workers=1, cache=None):
+    # Decides whether a csv-file is checked by the rule plan alone, in a single process without cache and
+    # measurements, which is the only engine that needs no pandas dataframe.
+    # Expects: - Whether the vectorized check-functions are to be used.
+    #          - The number of worker processes.
+    #          - An ErrorCache if only new or changed rows are to be checked.
+    # Returns: True if no pandas dataframe is needed.
+    return not (vectorized or workers > 1 or cache is not None or global_check_hooks)
+
+
+def fast_path(path, vectorized=False, workers=1, cache=None):
+    # Decides whether a csv-file is read with the csv-module instead of pandas. Only small files checked by the rule
+    # plan alone take the fast path, as pandas is imported only when it is needed and its import takes longer than
+    # checking a few hundred rows.
+    # Expects: - The path to the csv-file.
+    #          - Whether the vectorized check-functions are to be used.
+    #          - The number of worker processes.
+    #          - An ErrorCache if only new or changed rows are to be checked.
+    # Returns: True if the fast path is to be taken.
+    if not plain_rule_plan(vectorized, workers, cache):
+        return False
+    try:
+        return os.path.getsize(path) <= global_fast_path_size
+    except OSError:
         return False
-    else:
-        return True
-
 
-def check_media_types(mediatypes):
-    media_type_errors = []
 
-    for index, media_type in enumerate(mediatypes):
-        if media_type == "":
-            media_type_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: It is recommended to provide a media type for learning resources")
+def collect_batch_files(inputs):
+    # Expands the inputs of the batch mode into a list of csv-files. Directories are searched recursively for
+    # csv-files, glob patterns are expanded and manifests (.txt-files) are read line by line, with paths relative to
+    # the manifest. Empty lines and lines starting with '#' are ignored in manifests.
+    # Expects: A list of paths, directories, glob patterns and manifests.
+    # Returns: A list of paths without duplicates.
+    files = []
+    for entry in inputs:
+        if os.path.isdir(entry):
+            files.extend(sorted(glob.glob(os.path.join(entry, '**', '*.csv'), recursive=True)))
+        elif entry.endswith('.txt') and os.path.isfile(entry):
+            with open(entry, 'r') as manifest:
+                lines = [line.strip() for line in manifest]
+            base = os.path.dirname(entry)
+            files.extend(collect_batch_files(
+                [os.path.join(base, line) for line in lines if line and not line.startswith('#')]))
+        elif any(character in entry for character in '*?['):
+            files.extend(sorted(glob.glob(entry, recursive=True)))
         else:
-            if '*' in media_type:
-                type_list = split_into_list(media_type)
-                for element in type_list:
-                    if element not in global_media_types:
-                        media_type_errors.append(
-                            f"Line {index + global_header_lines + global_line_offset}: The provided media type is not in the DIF picklist.")
-            else:
-                if media_type not in global_media_types:
-                    media_type_errors.append(
-                        f"Line {index + global_header_lines + global_line_offset}: The provided media type is not in the DIF picklist.")
-    return media_type_errors
-
-
-def check_proficiency_levels(proficiency_levels):
-    proficiency_level_errors = []
-
-    for index, proficiency_level in enumerate(proficiency_levels):
-        if proficiency_level == "":
-            proficiency_level_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: It is recommended to provide at least one proficiency level for learning resources.")
+            files.append(entry)
+    return list(dict.fromkeys(files))
+
+
+def batch_report_names(files, output_directory):
+    # Creates the names of the reports of the batch mode. Files with the same name in different directories get a
+    # number appended.
+    # Expects: - A list of paths of csv-files.
+    #          - The directory the reports are written to.
+    # Returns: A list of report names without file extension.
+    names = []
+    used = set()
+    for path in files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name = f"report-{stem}"
+        number = 1
+        while name in used:
+            number += 1
+            name = f"report-{stem}-{number}"
+        used.add(name)
+        names.append(os.path.join(output_directory, name))
+    return names
+
+
+def check_batch_file(path, report_name, options):
+    # Checks a single csv-file of the batch mode. Errors reading the file are recorded in the summary instead of
+    # aborting the whole batch.
+    # Expects: - The path to the csv-file.
+    #          - The name of the report without file extension.
+    #          - A dictionary with the keyword arguments for check_file.
+    # Returns: A dictionary with the summary of the file.
+    summary = {'file': path, 'report': "", 'status': "ok", 'rows': 0, 'seconds': 0.0, 'errors': dict()}
+    start = time.perf_counter()
+    try:
+        if not os.path.isfile(path):
+            summary['status'] = "file not found"
         else:
-            if '*' in proficiency_level:
-                level_list = split_into_list(proficiency_level)
-                for level in level_list:
-                    if level not in global_proficiency_levels:
-                        proficiency_level_errors.append(
-                            f"Line {index + global_header_lines + global_line_offset}: The provided proficiency level is not in the DIF picklist.")
+            summary['rows'], summary['errors'] = check_file(path, report_name, **options)
+            summary['report'] = ";".join(report_file_names(report_name, options.get('formats', ('wide',))))
+    except (KeyError, OSError, ValueError) as error:
+        summary['status'] = f"{type(error).__name__}: {error}"
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+
+def check_batch(files, output_directory, options, workers=1):
+    # Checks many csv-files in one process and writes a report for every file and a summary of all files. The
+    # vocabularies are loaded once and shared by all files. With more than one worker the files are checked at the
+    # same time in a pool of processes.
+    # Expects: - A list of paths of csv-files.
+    #          - The directory the reports and the summary are written to.
+    #          - A dictionary with the keyword arguments for check_file.
+    #          - The number of worker processes.
+    # Returns: A list of dictionaries with the summaries of all files.
+    os.makedirs(output_directory, exist_ok=True)
+    report_names = batch_report_names(files, output_directory)
+    get_vocabulary()
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=get_vocabulary) as executor:
+            summaries = list(executor.map(check_batch_file, files, report_names, [options] * len(files)))
+    else:
+        summaries = [check_batch_file(path, report_name, options) for path, report_name in zip(files, report_names)]
+    write_batch_summary(summaries, os.path.join(output_directory, "summary.csv"))
+    return summaries
+
+
+def write_batch_summary(summaries, file_name):
+    # Writes the summary of the batch mode with one row per csv-file and the number of errors per Attribute.
+    # Expects: - A list of dictionaries with the summaries of all files.
+    #          - The name of the summary file.
+    # Returns: None.
+    columns = list(global_rule_checkers)
+    with open(file_name, 'w', newline="") as summary_file:
+        writer = csv.writer(summary_file)
+        writer.writerow(['File', 'Report', 'Status', 'Rows', 'Seconds', 'Errors'] + columns)
+        for summary in summaries:
+            errors = summary['errors']
+            writer.writerow([summary['file'], summary['report'], summary['status'], summary['rows'],
+                             f"{summary['seconds']:.3f}", sum(errors.values())] +
+                            [errors.get(column, 0) for column in columns])
+
+
+def structure_errors(errors):
+    # Turns all errors into records for the JSON responses of the validation service.
+    # Expects: A dictionary with the Attributes as keys and ColumnErrors as values.
+    # Returns: A dictionary with the Attributes as keys and lists of dictionaries with the line number, the severity,
+    #          the code and the message as values. Errors that belong to no line, like missing columns, have the line
+    #          number None.
+    structured = {column: [] for column in errors}
+    for line, column, severity, code, message in error_records(errors):
+        structured[column].append({'line': line, 'severity': severity, 'code': code, 'message': message})
+    return structured
+
+
+def check_request(request):
+    # Checks the data of a request of the validation service with the rule plan. The line numbers are passed to the
+    # rule plan instead of being set in globals, so the requests are checked at the same time.
+    # Expects: A dictionary with either 'csv', the content of a csv-file, 'rows', a list of dictionaries with the
+    #          Attributes as keys, or 'row', a single one of those dictionaries. Optionally 'header_lines' for 'csv'.
+    # Returns: A dictionary with the number of checked rows, the number of errors per code and the structured errors.
+    import pandas as pd
+    header_lines = int(request.get('header_lines', 0))
+    if header_lines < 0:
+        raise ValueError("The number of header lines can not be negative.")
+    if 'csv' in request:
+        dataframe = pd.read_csv(io.StringIO(request['csv']), dtype=str)
+    elif 'rows' in request or 'row' in request:
+        rows = request['rows'] if 'rows' in request else [request['row']]
+        dataframe = pd.DataFrame(rows).fillna("").astype(str)
+        header_lines = 0
+    else:
+        raise ValueError("The request contains neither 'csv', 'rows' nor 'row'.")
+
+    if header_lines > 0:
+        dataframe = dataframe.drop(index=range(header_lines))
+    fill_empty_cells(dataframe)
+    errors = get_rule_plan().check(dataframe, first_line=header_lines + global_line_offset)
+    return {'rows': len(dataframe), 'counts': count_error_codes(errors), 'errors': structure_errors(errors)}
+
+
+def serve_http(host, port):
+    # Runs the validation service as HTTP server until it is interrupted. Pandas, the vocabularies and the rule plan
+    # are loaded before the first request. The HTTP server is only imported here, as it takes a noticeable part of the
+    # startup time of a check.
+    # Expects: - The host name or address to listen on.
+    #          - The port to listen on.
+    # Returns: None.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import pandas
+    get_rule_plan()
+
+    class ValidationRequestHandler(BaseHTTPRequestHandler):
+        # Answers the requests of the validation service:
+        # - GET /health returns {"status": "ok"}.
+        # - POST /check checks the body, which is either a JSON request as accepted by check_request or the content of
+        #   a csv-file. For csv-files the number of header lines can be given as query parameter, e.g.
+        #   /check?header_lines=2.
+
+        def do_GET(self):
+            if urlparse(self.path).path == '/health':
+                self.send_json(200, {'status': "ok"})
             else:
-                if proficiency_level not in global_proficiency_levels:
-                    proficiency_level_errors.append(
-                        f"Line {index + global_header_lines + global_line_offset}: The provided proficiency level is not in the DIF picklist.")
-    return proficiency_level_errors
+                self.send_json(404, {'error': "Not found."})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path != '/check':
+                self.send_json(404, {'error': "Not found."})
+                return
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            try:
+                body = body.decode('utf-8')
+                if self.headers.get('Content-Type', "").startswith('application/json'):
+                    request = json.loads(body)
+                else:
+                    request = {'csv': body, 'header_lines': parse_qs(url.query).get('header_lines', ['0'])[0]}
+                self.send_json(200, check_request(request))
+            except (ValueError, KeyError, TypeError, AttributeError) as error:
+                self.send_json(400, {'error': f"{type(error).__name__}: {error}"})
+
+        def send_json(self, status, content):
+            data = json.dumps(content).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    class ValidationServer(ThreadingHTTPServer):
+        # Accepts more waiting connections than the default of 5, as the requests are checked at the same time.
+        request_queue_size = 64
+
+    with ValidationServer((host, port), ValidationRequestHandler) as server:
+        print(f"Serving on http://{host}:{server.server_port}/check", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def serve_stdin(input_stream=sys.stdin, output_stream=sys.stdout):
+    # Runs the validation service on line-delimited JSON: every line of the input is a request as accepted by
+    # check_request and is answered by one line of output. The 'id' of a request is copied to its response. Pandas,
+    # the vocabularies and the rule plan are loaded before the first request.
+    # Expects: - The stream the requests are read from.
+    #          - The stream the responses are written to.
+    # Returns: None.
+    import pandas
+    get_rule_plan()
+    for line in input_stream:
+        if not line.strip():
+            continue
+        request = None
+        try:
+            request = json.loads(line)
+            response = check_request(request)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            response = {'error': f"{type(error).__name__}: {error}"}
+        if isinstance(request, dict) and 'id' in request:
+            response['id'] = request['id']
+        output_stream.write(json.dumps(response) + "\n")
+        output_stream.flush()
 
 
-def check_date_format(publication_date):
-    if re.search(r"^\d{4}-\d{2}-\d{2}$", publication_date) is None and re.search(r"^\d{4}-\d{2}$",
-                                                                                publication_date) is None and re.search(
-            r"^\d{4}$", publication_date) is None:
-        return True
-    else:
-        return False
+def write_output(errors, file_name):
+    fieldnames = errors.keys()
+    with open(file_name, 'w', newline="") as report:
+        writer = csv.writer(report)
+        writer.writerow(fieldnames)
+        write_error_rows(writer, errors)
 
 
-def check_publication_dates(publication_dates):
-    publication_date_errors = []
+def write_error_rows(writer, errors):
+    # Writes the errors column by column into the rows of the report.
+    # Expects: - A csv-writer for the report file.
+    #          - A dictionary with the Attributes as keys and ColumnErrors as values.
+    # Returns: None.
+    max_length = max(len(values) for values in errors.values())
+    for i in range(max_length):
+        row = []
+        for key in errors:
+            if i < len(errors[key]):
+                row.append(errors[key][i])
+            else:
+                row.append('')
+        writer.writerow(row)
 
-    for index, publication_date in enumerate(publication_dates):
-        if publication_date == "":
-            publication_date_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: It is recommended to provide a publication date for learning resources.")
-        else:
-            if check_date_format(publication_date):
-                publication_date_errors.append(
-                    f"Line {index + global_header_lines + global_line_offset}: The provided publication date is not of the format xsd:date."
-                )
 
-    return publication_date_errors
+def open_report_file(file_name, position=None, newline=None):
+    # Opens a report file for writing. A report of an interrupted check is opened at the position of the checkpoint
+    # instead, so everything written after the checkpoint is removed and the report is continued.
+    # Expects: - The name of the report file.
+    #          - The size of the report at the checkpoint or None for a new report.
+    #          - The newline argument of open.
+    # Returns: A file object.
+    if position is None:
+        return open(file_name, 'w', newline=newline)
+    file = open(file_name, 'r+', newline=newline)
+    file.truncate(position)
+    file.seek(position)
+    return file
 
 
-def check_file_format(file_formats):
-    file_formats_list = read_data_formats_file()
-    file_format_errors = []
+class WideReportWriter:
+    # Writes the report with one column per Attribute, as write_output does, but chunk by chunk.
 
-    for index, file_format in enumerate(file_formats):
-        if file_format == "":
-            file_format_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: It is recommended to provide the file format of a learning resource.")
-        else:
-            if check_file_format_format(file_format):
-                file_format_errors.append(
-                    f"Line {index + global_header_lines + global_line_offset}: The provided file format is not formatted properly.")
-            else:
-                file_format_list = split_into_list(file_format)
-                if check_file_format_list(file_format_list, file_formats_list):
-                    file_format_errors.append(
-                        f"Line {index + global_header_lines + global_line_offset}: The provided file format is not included in the picklist.")
+    def __init__(self, file_name, position=None):
+        self.file = open_report_file(file_name, position, newline="")
+        self.writer = csv.writer(self.file)
+        self.header_written = position is not None
 
-    return file_format_errors
+    def write(self, errors):
+        if not self.header_written:
+            self.writer.writerow(errors.keys())
+            self.header_written = True
+        write_error_rows(self.writer, errors)
 
+    def position(self):
+        self.file.flush()
+        return self.file.tell()
 
-def check_file_format_format(file_format):
-    if re.search(r"^\.\w+(?:$|\s\*\s\.\w+)*$", file_format) is None:
-        return True
-    else:
-        return False
+    def close(self):
+        self.file.close()
 
 
-def check_file_format_list(file_format_list, file_formats):
-    for file_format in file_format_list:
-        if file_format not in file_formats:
-            return True
-    return False
+class LongReportWriter:
+    # Writes the report with one row per error and the fields of global_record_fields as columns.
 
+    def __init__(self, file_name, position=None):
+        self.file = open_report_file(file_name, position, newline="")
+        self.writer = csv.writer(self.file)
+        if position is None:
+            self.writer.writerow(global_record_fields)
 
-def check_target_group(target_groups):
-    target_groups_list = read_csv("resources/target_audience.csv")
-    target_group_errors = []
+    def write(self, errors):
+        self.writer.writerows(error_records(errors))
 
-    for index, target_group in enumerate(target_groups):
-        if target_group == "":
-            target_group_errors.append(
-                f"Line {index + global_header_lines + global_line_offset}: It is recommended to provide at least one target group for a learning resource.")
-        else:
-            if check_target_group_format(target_group):
-                target_group_errors.append(
-                    f"Line {index + global_header_lines + global_line_offset}: The provided target groups are not formatted properly.")
-            else:
-                target_group_list = split_into_list(target_group)
-                if check_target_group_list(target_group_list, target_groups_list):
-                    target_group_errors.append(
-                        f"Line {index + global_header_lines + global_line_offset}: The provided target group is not included in the picklist.")
-    return target_group_errors
+    def position(self):
+        self.file.flush()
+        return self.file.tell()
 
+    def close(self):
+        self.file.close()
 
-def check_target_group_format(target_group):
-    if re.search(r"^\w+(?:\s\(?\w+\)?)?(?:$|\s\*\s\w+(?:$|\s\(?\w+\)?))*", target_group) is None:
-        return True
-    else:
-        return False
 
+class JsonlReportWriter:
+    # Writes the report with one JSON object per error and line.
 
-def check_target_group_list(target_group_list, target_groups):
-    for target_group in target_group_list:
-        if target_group not in target_groups:
-            return True
-    return False
+    def __init__(self, file_name, position=None):
+        self.file = open_report_file(file_name, position)
 
+    def write(self, errors):
+        for record in error_records(errors):
+            self.file.write(json.dumps(dict(zip(global_record_fields, record))) + "\n")
 
-def check_data(dataframe):
-    # Checks data within a dataframe according to the rules of the DIF.
-    # Expects: A pandas dataframe.
-    # Returns: A dictionary with the Attributes as keys and lists of all errors as values.
-    errors = dict()
+    def position(self):
+        self.file.flush()
+        return self.file.tell()
 
-    if dataframe['Authors'] is not None:
-        errors['Authors'] = check_authors(dataframe['Authors'])
-    else:
-        errors['Authors'] = "The mandatory Attribute 'Authors' is missing from every item!"
+    def close(self):
+        self.file.close()
 
-    if dataframe['License'] is not None:
-        errors['License'] = check_licenses(dataframe['License'])
-    else:
-        errors['License'] = "The mandatory Attribute 'License' is missing from every item!"
 
-    if dataframe['Link'] is not None:
-        errors['Link'] = check_link(dataframe['Link'])
-    else:
-        errors['Link'] = "The mandatory Attribute 'License' is missing from every item!"
+class ParquetReportWriter:
+    # Writes the report as a Parquet file with one row per error and one row group per chunk. Needs pyarrow. As a
+    # Parquet file can not be continued, it has no position for checkpoints.
 
-    if dataframe['Title'] is not None:
-        errors['Title'] = check_title(dataframe['Title'])
-    else:
-        errors['Title'] = "The mandatory Attribute 'Title' is missing from every item!"
+    def __init__(self, file_name):
+        import pyarrow
+        import pyarrow.parquet
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([('line', pyarrow.int64())] +
+                                     [(field, pyarrow.string()) for field in global_record_fields[1:]])
+        self.writer = pyarrow.parquet.ParquetWriter(file_name, self.schema)
 
-    if dataframe['Description'] is not None:
-        errors['Description'] = check_description(dataframe['Description'])
-    else:
-        errors['Description'] = "It is recommended to provide a description for every item!"
+    def write(self, errors):
+        records = error_records(errors)
+        if records:
+            columns = {field: list(values) for field, values in zip(global_record_fields, zip(*records))}
+            self.writer.write_table(self.pyarrow.Table.from_pydict(columns, schema=self.schema))
 
-    if dataframe['Community'] is not None:
-        errors['Community'] = check_community(dataframe['Community'])
-    else:
-        errors[
-            'Community'] = "It is recommended to provide information about recommending and supporting communities!"
+    def close(self):
+        self.writer.close()
 
-    if dataframe['Discipline'] is not None:
-        errors['Discipline'] = check_disciplines(dataframe['Discipline'])
-    else:
-        errors[
-            'Discipline'] = "It is recommended to provide at least one relevant discipline listed in https://skohub.io/dini-ag-kim/hochschulfaechersystematik/heads/master/w3id.org/kim/hochschulfaechersystematik/scheme.html"
 
-    if dataframe['MediaType'] is not None:
-        errors['MediaType'] = check_media_types(dataframe['MediaType'])
-    else:
-        errors['MediaType'] = "It is recommended to provide media types for learning resources."
+global_report_formats = {'wide': ".csv", 'long': ".long.csv", 'jsonl': ".jsonl", 'parquet': ".parquet"}
+global_report_writers = {
+    'wide': WideReportWriter,
+    'long': LongReportWriter,
+    'jsonl': JsonlReportWriter,
+    'parquet': ParquetReportWriter
+}
 
-    if dataframe['ProficiencyLevel'] is not None:
-        errors['ProficiencyLevel'] = check_proficiency_levels(dataframe['ProficiencyLevel'])
-    else:
-        errors['ProficiencyLevel'] = "It is recommended to provide proficiency levels for learning resources."
 
-    if dataframe['PublicationDate'] is not None:
-        errors['PublicationDate'] = check_publication_dates(dataframe['PublicationDate'])
-    else:
-        errors['PublicationDate'] = "It is recommended to provide publication dates for learning resources."
+def report_file_names(report_name, formats):
+    # Creates the names of the report files of all formats.
+    # Expects: - The name of the report without file extension.
+    #          - A list of formats from global_report_formats.
+    # Returns: A list of file names.
+    return [report_name + global_report_formats[report_format] for report_format in formats]
 
-    if dataframe['FileFormat'] is not None:
-        errors['FileFormat'] = check_file_format(dataframe['FileFormat'])
-    else:
-        errors['FileFormat'] = "It is recommended to provide the file formats of the resources."
 
-    if dataframe['TargetGroup'] is not None:
-        errors['TargetGroup'] = check_target_group(dataframe['TargetGroup'])
-    else:
-        errors['TargetGroup'] = "It is recommended to provide at least one target group for a learning resource."
+def open_report_writers(report_name, formats, positions=None):
+    # Opens a report writer for every format. The errors can be written to all of them chunk by chunk, as they are
+    # produced.
+    # Expects: - The name of the report without file extension.
+    #          - A list of formats from global_report_formats.
+    #          - A list with the sizes of the reports at a checkpoint, if an interrupted check is resumed.
+    # Returns: A list of report writers.
+    writers = []
+    try:
+        for number, (report_format, file_name) in enumerate(zip(formats, report_file_names(report_name, formats))):
+            if positions is None:
+                writers.append(global_report_writers[report_format](file_name))
+            else:
+                writers.append(global_report_writers[report_format](file_name, positions[number]))
+    except BaseException:
+        close_report_writers(writers)
+        raise
+    return writers
 
-    return errors
 
+def write_reports(writers, errors):
+    # Writes the errors of a chunk to all report writers.
+    # Expects: - A list of report writers.
+    #          - A dictionary with the Attributes as keys and ColumnErrors as values.
+    # Returns: None.
+    for writer in writers:
+        writer.write(errors)
 
-def write_output(errors, file_name):
-    fieldnames = errors.keys()
-    max_length = max(len(values) for values in errors.values())
-    with open(file_name, 'w', newline="") as report:
-        writer = csv.writer(report)
-        writer.writerow(fieldnames)
 
-        for i in range(max_length):
-            row = []
-            for key in errors:
-                if i < len(errors[key]):
-                    row.append(errors[key][i])
-                else:
-                    row.append('')
-            writer.writerow(row)
+def close_report_writers(writers):
+    # Closes all report writers.
+    # Expects: A list of report writers.
+    # Returns: None.
+    for writer in writers:
+        writer.close()
 
 
 if __name__ == '__main__':
     args = parse_arguments()
 
-    csv_file = read_csv(args.input_filename)
-    if args.header_lines is not None and args.header_lines > 0:
-        remove_header_lines(args.header_lines, csv_file)
-    fill_empty_cells(csv_file)
-    found_errors = check_data(csv_file)
-
-    if args.output_filename is not None:
-        filename = f"./{args.output_filename}.csv"
+    profiler = None
+    if args.profile or args.profile_json is not None or args.profile_trace is not None:
+        profiler = CheckProfiler()
+        add_check_hook(profiler)
+    if args.progress:
+        add_progress_hook(ProgressPrinter())
+
+    check_options = {
+        'header_lines': max(args.header_lines or 0, 0),
+        'stream': args.stream,
+        'chunk_size': args.chunk_size,
+        'vectorized': args.vectorized,
+        'formats': list(dict.fromkeys(args.report_format)),
+        'duplicates': args.duplicates,
+        'similarity': args.similarity,
+        'mapped': args.mmap,
+        'max_errors': args.max_errors,
+        'column_budgets': args.column_budget,
+        'fail_fast': args.fail_fast
+    }
+    deep_check = None
+    if args.deep_check:
+        deep_check = DeepCheck(
+            read_discipline_scheme(args.discipline_scheme) if 'disciplines' in args.deep_check else None,
+            LinkResolver(args.link_cache, args.link_ttl * 3600, args.link_concurrency, args.link_timeout,
+                         args.link_origin) if 'links' in args.deep_check else None)
+        check_options['deep_check'] = deep_check
+    if args.serve is not None:
+        serve_http(args.host, args.serve)
+    elif args.serve_stdin:
+        serve_stdin()
+    elif args.batch:
+        batch_files = collect_batch_files(args.input_filename)
+        batch_summaries = check_batch(batch_files, args.output_filename or "reports", check_options, args.workers)
+        failed = [summary for summary in batch_summaries if summary['status'] != "ok"]
+        print(f"Checked {len(batch_summaries)} files with {sum(summary['rows'] for summary in batch_summaries)} rows, "
+              f"{len(failed)} could not be checked.")
     else:
-        filename = f"./report-{args.input_filename}.csv"
-    write_output(found_errors, filename)
+        input_filename = args.input_filename[0]
+        if args.output_filename is not None:
+            report_name = f"./{args.output_filename}"
+        else:
+            report_name = f"./report-{input_filename}"
+        if args.sample is not None:
+            sample_result = check_sample(input_filename, report_name, args.sample, check_options['header_lines'],
+                                         args.strata, args.seed, args.confidence, check_options['formats'],
+                                         deep_check)
+            if sample_result is not None:
+                print_estimates(*sample_result, args.confidence)
+        else:
+            error_cache = ErrorCache(args.cache) if args.cache is not None else None
+            stream_checkpoint = None
+            if args.checkpoint is not None and os.path.isfile(input_filename):
+                options = (report_name, args.workers, args.cache, args.deep_check,
+                           sorted((name, repr(value)) for name, value in check_options.items() if name != 'deep_check'))
+                stream_checkpoint = StreamCheckpoint(args.checkpoint, input_filename, repr(options),
+                                                     args.checkpoint_interval)
+            check_file(input_filename, report_name, workers=args.workers, cache=error_cache,
+                       checkpoint=stream_checkpoint, **check_options)
+            if error_cache is not None:
+                error_cache.close()
+    if deep_check is not None:
+        deep_check.close()
+
+    if profiler is not None:
+        if args.profile:
+            profiler.print_summary()
+        if args.profile_json is not None:
+            profiler.write_json(args.profile_json)
+        if args.profile_trace is not None:
+            profiler.write_chrome_trace(args.profile_trace)